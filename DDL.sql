@@ -14,6 +14,8 @@
 /*!40014 SET @OLD_FOREIGN_KEY_CHECKS=@@FOREIGN_KEY_CHECKS, FOREIGN_KEY_CHECKS=0 */;
 /*!40101 SET @OLD_SQL_MODE=@@SQL_MODE, SQL_MODE='NO_AUTO_VALUE_ON_ZERO' */;
 /*!40111 SET @OLD_SQL_NOTES=@@SQL_NOTES, SQL_NOTES=0 */;
+-- 全文索引不使用停用词表：ngram分词下，含停用词(如a、i)的词元都会被丢弃，全文检索结果将与LIKE不一致
+SET SESSION innodb_ft_enable_stopword = OFF;
 
 --
 -- Table structure for table `book`
@@ -38,7 +40,8 @@ CREATE TABLE `book` (
   `type` enum('马列主义、毛泽东思想、邓小平理论','哲学、宗教','社会科学总论','政治、法律','军事','经济','文化、科学、教育、体育','语言、文字','文学','艺术','历史、地理','自然科学总论','数理科学和化学','天文学、地球科学','生物科学','医药、卫生','农业科学','工业技术','交通运输','航空、航天','环境科学、安全科学','综合性图书') DEFAULT NULL COMMENT '图书类型',
   PRIMARY KEY (`id`),
   UNIQUE KEY `isbn` (`isbn`),
-  KEY `name` (`title`)
+  KEY `name` (`title`),
+  FULLTEXT KEY `book_fulltext` (`title`,`author`) /*!50100 WITH PARSER `ngram` */
 ) ENGINE=InnoDB AUTO_INCREMENT=5 DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
 /*!40101 SET character_set_client = @saved_cs_client */;
 
@@ -68,7 +71,7 @@ CREATE TABLE `chat` (
   `isRead` tinyint(1) NOT NULL DEFAULT '0' COMMENT '是否查看',
   PRIMARY KEY (`id`),
   KEY `chat_user_id_fk` (`senderID`),
-  KEY `chat_user_id_fk2` (`receiverID`),
+  KEY `chat_user_id_fk2` (`receiverID`,`isRead`),
   CONSTRAINT `chat_user_id_fk` FOREIGN KEY (`senderID`) REFERENCES `user` (`id`) ON DELETE CASCADE ON UPDATE CASCADE,
   CONSTRAINT `chat_user_id_fk2` FOREIGN KEY (`receiverID`) REFERENCES `user` (`id`) ON DELETE SET DEFAULT ON UPDATE CASCADE
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
@@ -129,6 +132,7 @@ CREATE TABLE `group` (
   PRIMARY KEY (`id`),
   UNIQUE KEY `group_name_uindex` (`name`),
   KEY `group_user_id_fk` (`founderID`),
+  FULLTEXT KEY `group_fulltext` (`name`,`description`) /*!50100 WITH PARSER `ngram` */ ,
   CONSTRAINT `group_user_id_fk` FOREIGN KEY (`founderID`) REFERENCES `user` (`id`) ON DELETE CASCADE ON UPDATE CASCADE
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci COMMENT='圈子(但是我觉得叫group更合适)';
 /*!40101 SET character_set_client = @saved_cs_client */;
@@ -158,7 +162,7 @@ CREATE TABLE `group_discussion` (
   `content` text NOT NULL COMMENT '帖子内容',
   `isRead` tinyint(1) NOT NULL DEFAULT '0' COMMENT '是否查看',
   PRIMARY KEY (`id`),
-  KEY `group_discussion_group_id_fk` (`groupID`),
+  KEY `group_discussion_group_id_fk` (`groupID`,`isRead`),
   KEY `group_discussion_user_id_fk` (`posterID`),
   CONSTRAINT `group_discussion_group_id_fk` FOREIGN KEY (`groupID`) REFERENCES `group` (`id`) ON DELETE CASCADE ON UPDATE CASCADE,
   CONSTRAINT `group_discussion_user_id_fk` FOREIGN KEY (`posterID`) REFERENCES `user` (`id`) ON DELETE CASCADE ON UPDATE CASCADE
@@ -188,7 +192,7 @@ CREATE TABLE `group_discussion_reply` (
   `content` text NOT NULL COMMENT '回复内容',
   `isRead` tinyint(1) NOT NULL DEFAULT '0' COMMENT '是否查看',
   PRIMARY KEY (`authorID`,`discussionID`,`replyTime`),
-  KEY `discuss_reply_discuss_id_fk` (`discussionID`),
+  KEY `discuss_reply_discuss_id_fk` (`discussionID`,`isRead`),
   CONSTRAINT `discuss_reply_discuss_id_fk` FOREIGN KEY (`discussionID`) REFERENCES `group_discussion` (`id`) ON DELETE CASCADE ON UPDATE CASCADE,
   CONSTRAINT `discuss_reply_user_id_fk` FOREIGN KEY (`authorID`) REFERENCES `user` (`id`) ON DELETE CASCADE ON UPDATE CASCADE
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
@@ -248,6 +252,7 @@ CREATE TABLE `journal` (
   PRIMARY KEY (`id`),
   KEY `journal_user_id_fk` (`authorID`),
   KEY `journal_book_id_fk` (`bookID`),
+  FULLTEXT KEY `journal_fulltext` (`title`,`content`) /*!50100 WITH PARSER `ngram` */ ,
   CONSTRAINT `journal_book_id_fk` FOREIGN KEY (`bookID`) REFERENCES `book` (`id`) ON DELETE CASCADE ON UPDATE CASCADE,
   CONSTRAINT `journal_user_id_fk` FOREIGN KEY (`authorID`) REFERENCES `user` (`id`) ON DELETE CASCADE ON UPDATE CASCADE
 ) ENGINE=InnoDB AUTO_INCREMENT=2 DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
@@ -277,8 +282,8 @@ CREATE TABLE `journal_comment` (
   `content` text NOT NULL COMMENT '评论内容',
   `isRead` tinyint(1) NOT NULL DEFAULT '0' COMMENT '是否查看',
   PRIMARY KEY (`id`),
-  KEY `journal_comment_journal_id_fk` (`journalID`),
-  KEY `journal_comment_user_id_fk` (`authorID`),
+  KEY `journal_comment_journal_id_fk` (`journalID`,`isRead`),
+  KEY `journal_comment_user_id_fk` (`authorID`,`isRead`),
   CONSTRAINT `journal_comment_journal_id_fk` FOREIGN KEY (`journalID`) REFERENCES `journal` (`id`) ON DELETE CASCADE ON UPDATE CASCADE,
   CONSTRAINT `journal_comment_user_id_fk` FOREIGN KEY (`authorID`) REFERENCES `user` (`id`) ON DELETE CASCADE ON UPDATE CASCADE
 ) ENGINE=InnoDB AUTO_INCREMENT=5 DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
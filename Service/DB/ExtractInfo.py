@@ -5,45 +5,96 @@ __doc__ = """数据库提取服务模块
 这些函数主要用于将数据库对象转换为前端可用的数据格式。
 """
 
+from operator import attrgetter, itemgetter
+from typing import Callable
+
+# 各模型需要提取的字段名，模块加载时构造一次，避免每次调用重复构造字典字面量
+_USER_FIELDS = ("id", "account", "signature", "email", "telephone", "role")
+_USER_WITH_PASSWORD_FIELDS = _USER_FIELDS + ("password",)
+_JOURNAL_FIELDS = ("id", "title", "firstParagraph", "content", "publishTime", "authorID", "bookID")
+_BOOK_FIELDS = ("id", "isbn", "title", "originTitle", "subtitle", "author", "page", "publishDate", "publisher",
+                "description", "doubanScore", "doubanID", "type")
+_GROUP_FIELDS = ("id", "name", "description", "establishTime", "founderID")
+_GROUP_DISCUSSION_FIELDS = ("id", "groupID", "posterID", "postTime", "title", "content", "isRead")
+_ERROR_FIELDS = ("errorCode", "title", "title_en", "content", "publishTime", "authorID", "referenceLink")
+_JOURNAL_COMMENT_FIELDS = ("id", "journalID", "authorID", "content", "publishTime", "isRead")
+_GROUP_USER_FIELDS = ("userID", "groupID", "joinTime")
+_GROUP_DISCUSSION_REPLY_FIELDS = ("authorID", "discussionID", "replyTime", "content", "isRead")
+_CHAT_FIELDS = ("id", "senderID", "receiverID", "content", "sendTime", "isRead")
+
+
+def _fieldGetter(fields: tuple) -> Callable[[object], tuple]:
+    """
+    生成一次性读取模型多个字段的函数，返回与字段名顺序一致的元组
+
+    已加载的字段直接从实例的__dict__中读取，绕过SQLAlchemy属性描述符的开销；
+    若有字段尚未加载（如提交后过期），则回退到attrgetter，由SQLAlchemy负责懒加载。
+    """
+    fromDict = itemgetter(*fields)
+    fromAttr = attrgetter(*fields)
+
+    def getFields(obj) -> tuple:
+        try:
+            return fromDict(obj.__dict__)
+        except KeyError:
+            return fromAttr(obj)
+
+    return getFields
+
 
-def extractUser(user, withPassword=False):
+_getUserFields = _fieldGetter(_USER_FIELDS)
+_getUserWithPasswordFields = _fieldGetter(_USER_WITH_PASSWORD_FIELDS)
+_getJournalFields = _fieldGetter(_JOURNAL_FIELDS)
+_getBookFields = _fieldGetter(_BOOK_FIELDS)
+_getGroupFields = _fieldGetter(_GROUP_FIELDS)
+_getGroupDiscussionFields = _fieldGetter(_GROUP_DISCUSSION_FIELDS)
+_getErrorFields = _fieldGetter(_ERROR_FIELDS)
+_getJournalCommentFields = _fieldGetter(_JOURNAL_COMMENT_FIELDS)
+_getGroupUserFields = _fieldGetter(_GROUP_USER_FIELDS)
+_getGroupDiscussionReplyFields = _fieldGetter(_GROUP_DISCUSSION_REPLY_FIELDS)
+_getChatFields = _fieldGetter(_CHAT_FIELDS)
+
+# 字段固定的小型记录使用预构建的模板字典，copy()复用模板的哈希表，无需重新构建
+_GROUP_USER_TEMPLATE = dict.fromkeys(_GROUP_USER_FIELDS)
+_GROUP_DISCUSSION_REPLY_TEMPLATE = dict.fromkeys(_GROUP_DISCUSSION_REPLY_FIELDS)
+
+
+def extractUser(user) -> dict:
     """
-    从用户对象中提取用户信息并转换为字典格式
+    从用户对象中提取用户信息并转换为字典格式（不含密码）
 
     Args:
         user: 用户数据库模型对象
-        withPassword: 布尔值，是否在返回数据中包含密码字段
-            - True: 返回包含密码的完整用户信息
-            - False: 返回不包含密码的用户信息（默认）
 
     Returns:
         dict: 包含用户信息的字典，字段包括：
             - id: 用户ID
             - account: 用户账号
-            - password: 用户密码（仅当withPassword=True时返回）
             - signature: 用户签名
             - email: 用户邮箱
             - telephone: 用户电话
             - role: 用户角色
     """
-    if withPassword:
-        return {"id": user.id,
-                "account": user.account,
-                "password": user.password,
-                "signature": user.signature,
-                "email": user.email,
-                "telephone": user.telephone,
-                "role": user.role}
-    else:
-        return {"id": user.id,
-                "account": user.account,
-                "signature": user.signature,
-                "email": user.email,
-                "telephone": user.telephone,
-                "role": user.role}
-
-
-def extractJournal(journal, likeNum: int, commentNum: int):
+    return dict(zip(_USER_FIELDS, _getUserFields(user)))
+
+
+def extractUserWithPassword(user) -> dict:
+    """
+    从用户对象中提取包含密码的用户信息并转换为字典格式
+
+    仅在确实需要密码字段时使用，其余场景请使用extractUser。
+
+    Args:
+        user: 用户数据库模型对象
+
+    Returns:
+        dict: 在extractUser返回字段的基础上，额外包含：
+            - password: 用户密码（加密后）
+    """
+    return dict(zip(_USER_WITH_PASSWORD_FIELDS, _getUserWithPasswordFields(user)))
+
+
+def extractJournal(journal, likeNum: int, commentNum: int, lean: bool = False) -> dict:
     """
     从日志对象中提取日志信息并转换为字典格式
 
@@ -51,31 +102,33 @@ def extractJournal(journal, likeNum: int, commentNum: int):
         journal: 日志数据库模型对象
         likeNum: 整数，该日志获得的点赞数
         commentNum: 整数，该日志获得的评论数
+        lean: 为True时content保持原始字符串，不按行分割；列表页只展示首段，无需分割全文
 
     Returns:
         dict: 包含日志信息的字典，字段包括：
             - id: 日志ID
             - title: 日志标题
             - firstParagraph: 日志第一段内容
-            - content: 日志内容（按行分割的列表）
+            - content: 日志内容（按行分割的列表，lean为True时为原始字符串）
             - publishTime: 发布时间
             - authorID: 作者ID
             - bookID: 相关书籍ID
             - likeNum: 点赞数
             - commentNum: 评论数
     """
-    return {"id": journal.id,
-            "title": journal.title,
-            "firstParagraph": journal.firstParagraph,
-            "content": journal.content.split("\n"),
-            "publishTime": journal.publishTime,
-            "authorID": journal.authorID,
-            "bookID": journal.bookID,
+    journalID, title, firstParagraph, content, publishTime, authorID, bookID = _getJournalFields(journal)
+    return {"id": journalID,
+            "title": title,
+            "firstParagraph": firstParagraph,
+            "content": content if lean else content.split("\n"),
+            "publishTime": publishTime,
+            "authorID": authorID,
+            "bookID": bookID,
             "likeNum": likeNum,
             "commentNum": commentNum}
 
 
-def extractJournalComment(comment):
+def extractJournalComment(comment) -> dict:
     """
     从日志评论对象中提取评论信息并转换为字典格式
 
@@ -91,12 +144,7 @@ def extractJournalComment(comment):
             - publishTime: 发布时间
             - isRead: 是否已读
     """
-    return {"id": comment.id,
-            "journalID": comment.journalID,
-            "authorID": comment.authorID,
-            "content": comment.content,
-            "publishTime": comment.publishTime,
-            "isRead": comment.isRead}
+    return dict(zip(_JOURNAL_COMMENT_FIELDS, _getJournalCommentFields(comment)))
 
 
 def extractBook(book) -> dict:
@@ -122,19 +170,41 @@ def extractBook(book) -> dict:
             - doubanID: 豆瓣ID
             - type: 书籍类型
     """
-    return {"id": book.id,
-            "isbn": book.isbn,
-            "title": book.title,
-            "originTitle": book.originTitle,
-            "subtitle": book.subtitle,
-            "author": book.author,
-            "page": book.page,
-            "publishDate": book.publishDate,
-            "publisher": book.publisher,
-            "description": book.description,
-            "doubanScore": book.doubanScore,
-            "doubanID": book.doubanID,
-            "type": book.type}
+    return dict(zip(_BOOK_FIELDS, _getBookFields(book)))
+
+
+def extractBooks(books) -> list[dict]:
+    """
+    批量提取书籍信息，用于书籍列表等返回多条记录的场景
+
+    先用同一个字段读取函数取出所有书籍的字段值，再统一组装为字典，
+    避免在循环中逐条调用extractBook。
+
+    Args:
+        books: 书籍数据库模型对象的可迭代集合
+
+    Returns:
+        list[dict]: 书籍信息字典列表，字段与extractBook相同
+    """
+    return [dict(zip(_BOOK_FIELDS, values)) for values in map(_getBookFields, books)]
+
+
+def extractBooksBulk(query) -> list[dict]:
+    """
+    直接从书籍查询中提取书籍信息，用于返回大量记录的场景
+
+    只查询extractBook需要的列，得到的结果行直接组装为字典，
+    跳过ORM模型对象的构造（实例化、身份映射、属性跟踪）。
+
+    Args:
+        query: 以书籍模型为查询实体的Query对象，可以已包含过滤、排序、数量限制和yield_per分批设置
+
+    Returns:
+        list[dict]: 书籍信息字典列表，字段与extractBook相同
+    """
+    book = query.column_descriptions[0]["entity"]
+    rows = query.with_entities(*[getattr(book, field) for field in _BOOK_FIELDS])
+    return [dict(zip(_BOOK_FIELDS, row)) for row in rows]
 
 
 def extractGroup(group) -> dict:
@@ -152,11 +222,20 @@ def extractGroup(group) -> dict:
             - establishTime: 建立时间
             - founderID: 创建者ID
     """
-    return {"id": group.id,
-            "name": group.name,
-            "description": group.description,
-            "establishTime": group.establishTime,
-            "founderID": group.founderID}
+    return dict(zip(_GROUP_FIELDS, _getGroupFields(group)))
+
+
+def extractGroups(groups) -> list[dict]:
+    """
+    批量提取圈子信息，用于圈子列表等返回多条记录的场景
+
+    Args:
+        groups: 圈子数据库模型对象的可迭代集合
+
+    Returns:
+        list[dict]: 圈子信息字典列表，字段与extractGroup相同
+    """
+    return [dict(zip(_GROUP_FIELDS, values)) for values in map(_getGroupFields, groups)]
 
 
 def extractGroupUser(groupUser) -> dict:
@@ -172,9 +251,15 @@ def extractGroupUser(groupUser) -> dict:
             - groupID: 圈子ID
             - joinTime: 加入时间
     """
-    return {"userID": groupUser.userID,
-            "groupID": groupUser.groupID,
-            "joinTime": groupUser.joinTime}
+    values = groupUser.__dict__
+    info = _GROUP_USER_TEMPLATE.copy()
+    try:
+        info["userID"] = values["userID"]
+        info["groupID"] = values["groupID"]
+        info["joinTime"] = values["joinTime"]
+    except KeyError:  # 存在未加载的字段，交由SQLAlchemy懒加载
+        return dict(zip(_GROUP_USER_FIELDS, _getGroupUserFields(groupUser)))
+    return info
 
 
 def extractGroupDiscussion(groupDiscussion) -> dict:
@@ -194,13 +279,7 @@ def extractGroupDiscussion(groupDiscussion) -> dict:
             - content: 讨论内容
             - isRead: 是否已读
     """
-    return {"id": groupDiscussion.id,
-            "groupID": groupDiscussion.groupID,
-            "posterID": groupDiscussion.posterID,
-            "postTime": groupDiscussion.postTime,
-            "title": groupDiscussion.title,
-            "content": groupDiscussion.content,
-            "isRead": groupDiscussion.isRead}
+    return dict(zip(_GROUP_DISCUSSION_FIELDS, _getGroupDiscussionFields(groupDiscussion)))
 
 
 def extractGroupDiscussionReply(reply) -> dict:
@@ -218,11 +297,17 @@ def extractGroupDiscussionReply(reply) -> dict:
             - content: 回复内容
             - isRead: 是否已读
     """
-    return {"authorID": reply.authorID,
-            "discussionID": reply.discussionID,
-            "replyTime": reply.replyTime,
-            "content": reply.content,
-            "isRead": reply.isRead}
+    values = reply.__dict__
+    info = _GROUP_DISCUSSION_REPLY_TEMPLATE.copy()
+    try:
+        info["authorID"] = values["authorID"]
+        info["discussionID"] = values["discussionID"]
+        info["replyTime"] = values["replyTime"]
+        info["content"] = values["content"]
+        info["isRead"] = values["isRead"]
+    except KeyError:  # 存在未加载的字段，交由SQLAlchemy懒加载
+        return dict(zip(_GROUP_DISCUSSION_REPLY_FIELDS, _getGroupDiscussionReplyFields(reply)))
+    return info
 
 
 def extractError(error) -> dict:
@@ -242,21 +327,15 @@ def extractError(error) -> dict:
             - authorID: 作者ID
             - referenceLink: 参考链接
     """
-    return {"errorCode": error.errorCode,
-            "title": error.title,
-            "title_en": error.title_en,
-            "content": error.content,
-            "publishTime": error.publishTime,
-            "authorID": error.authorID,
-            "referenceLink": error.referenceLink}
+    return dict(zip(_ERROR_FIELDS, _getErrorFields(error)))
 
 
-def extractChat(char) -> dict:
+def extractChat(chat) -> dict:
     """
     从聊天对象中提取聊天信息并转换为字典格式
 
     Args:
-        char: 聊天数据库模型对象
+        chat: 聊天数据库模型对象
 
     Returns:
         dict: 包含聊天信息的字典，字段包括：
@@ -267,9 +346,4 @@ def extractChat(char) -> dict:
             - sendTime: 发送时间
             - isRead: 是否已读
     """
-    return {"id": char.id,
-            "senderID": char.senderID,
-            "receiverID": char.receiverID,
-            "content": char.content,
-            "sendTime": char.sendTime,
-            "isRead": char.isRead}
+    return dict(zip(_CHAT_FIELDS, _getChatFields(chat)))
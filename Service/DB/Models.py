@@ -0,0 +1,242 @@
+from flask_sqlalchemy import SQLAlchemy
+
+__doc__ = """
+数据模型模块
+
+该模块在导入时定义一次所有数据库模型类，由Database在初始化时通过db.init_app(app)绑定到Flask应用。
+包括以下模型：
+- User: 用户模型
+- Book: 书籍模型
+- Journal: 日志模型
+- JournalComment: 日志评论模型
+- JournalLike: 日志点赞模型
+- Group: 圈子模型
+- GroupDiscussion: 圈子讨论模型
+- GroupUser: 圈子用户关系模型
+- GroupDiscussionReply: 圈子讨论回复模型
+- Error: 错误信息模型
+- Chat: 聊天消息模型
+"""
+
+db = SQLAlchemy()
+
+
+class User(db.Model):
+    """用户模型"""
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    account = db.Column(db.String(24), unique=True)
+    password = db.Column(db.Text, unique=False)  # scrypt哈希超过128个字符
+    signature = db.Column(db.String(128), unique=False)
+    email = db.Column(db.String(120), unique=False)
+    telephone = db.Column(db.String(11), unique=False)
+    lastLoginTime = db.Column(db.DateTime, unique=False)
+    role = db.Column(db.Enum("student", "teacher", "admin"), unique=False)
+
+    def __init__(self, account, password, signature, email, telephone, lastLoginTime, role):
+        self.account = account
+        self.password = password
+        self.signature = signature
+        self.email = email
+        self.telephone = telephone
+        self.lastLoginTime = lastLoginTime
+        self.role = role
+
+
+class Book(db.Model):
+    """书籍模型"""
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    isbn = db.Column(db.String(32), unique=True)
+    title = db.Column(db.String(128), unique=False)
+    originTitle = db.Column(db.String(128), unique=False)
+    subtitle = db.Column(db.String(128), unique=False)
+    author = db.Column(db.String(128), unique=False)
+    page = db.Column(db.Integer, unique=False)
+    publishDate = db.Column(db.String(24), unique=False)
+    publisher = db.Column(db.String(32), unique=False)
+    description = db.Column(db.Text, unique=False)
+    doubanScore = db.Column(db.Float, unique=False)
+    doubanID = db.Column(db.String(24), unique=False)
+    type = db.Column(
+        db.Enum("马列主义、毛泽东思想、邓小平理论", "哲学、宗教", "社会科学总论", "政治、法律", "军事", "经济",
+                "文化、科学、教育、体育", "语言、文字", "文学", "艺术", "历史、地理", "自然科学总论",
+                "数理科学和化学", "天文学、地球科学", "生物科学", "医药、卫生", "农业科学", "工业技术",
+                "交通运输", "航空、航天", "环境科学、安全科学", "综合性图书"), unique=False)
+    __table_args__ = (db.Index("book_fulltext", "title", "author",
+                               mysql_prefix="FULLTEXT", mysql_with_parser="ngram"),  # 全文索引
+                      db.Index("name", "title"))  # 对应DDL.sql中的KEY name
+
+    def __init__(self, isbn, title, originTitle, subtitle, author, page, publishDate, publisher, description,
+                 doubanScore, doubanID, type):
+        self.isbn = isbn
+        self.title = title
+        self.originTitle = originTitle
+        self.subtitle = subtitle
+        self.author = author
+        self.page = page
+        self.publishDate = publishDate
+        self.publisher = publisher
+        self.description = description
+        self.doubanScore = doubanScore
+        self.doubanID = doubanID
+        self.type = type
+
+
+class Journal(db.Model):
+    """日志模型"""
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    title = db.Column(db.String(128), unique=False)
+    firstParagraph = db.Column(db.Text, unique=False)
+    content = db.Column(db.Text, unique=False)
+    publishTime = db.Column(db.DateTime, unique=False)
+    authorID = db.Column(db.Integer, unique=False)
+    bookID = db.Column(db.Integer, unique=False)
+    __table_args__ = (db.Index("journal_fulltext", "title", "content",
+                               mysql_prefix="FULLTEXT", mysql_with_parser="ngram"),  # 全文索引
+                      db.Index("journal_user_id_fk", "authorID"),  # 按作者查询
+                      db.Index("journal_book_id_fk", "bookID"))  # 按书籍查询
+
+    def __init__(self, title, firstParagraph, content, publishTime, authorID, bookID):
+        self.title = title
+        self.firstParagraph = firstParagraph
+        self.content = content
+        self.publishTime = publishTime
+        self.authorID = authorID
+        self.bookID = bookID
+
+
+class JournalComment(db.Model):
+    """日志评论模型"""
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    publishTime = db.Column(db.DateTime, unique=False)
+    authorID = db.Column(db.Integer, unique=False)
+    journalID = db.Column(db.Integer, unique=False)
+    content = db.Column(db.Text, unique=False)
+    isRead = db.Column(db.Boolean, nullable=False, default=False)
+    __table_args__ = (db.Index("journal_comment_journal_id_fk", "journalID", "isRead"),  # 按书评查询评论、标记已读
+                      db.Index("journal_comment_user_id_fk", "authorID", "isRead"))  # 未读评论查询
+
+    def __init__(self, publishTime, authorID, journalID, content):
+        self.publishTime = publishTime
+        self.authorID = authorID
+        self.journalID = journalID
+        self.content = content
+
+
+class JournalLike(db.Model):
+    """日志点赞模型"""
+    authorID = db.Column(db.Integer, unique=False)
+    journalID = db.Column(db.Integer, unique=False)
+    __table_args__ = (db.PrimaryKeyConstraint('authorID', 'journalID'),  # 让authorID和journalID作为联合主键
+                      db.Index("journal_like_journal_id_fk", "journalID"))  # 联合主键以authorID开头，按书评统计点赞需单独索引
+    publishTime = db.Column(db.DateTime, unique=False)
+
+    def __init__(self, authorID, journalID, publishTime):
+        self.authorID = authorID
+        self.journalID = journalID
+        self.publishTime = publishTime
+
+
+class Group(db.Model):
+    """圈子模型"""
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    name = db.Column(db.String(32), unique=True)
+    founderID = db.Column(db.Integer, unique=False)
+    description = db.Column(db.Text, unique=False)
+    establishTime = db.Column(db.DateTime, unique=False)
+    __table_args__ = (db.Index("group_fulltext", "name", "description",
+                               mysql_prefix="FULLTEXT", mysql_with_parser="ngram"),  # 全文索引
+                      db.Index("group_user_id_fk", "founderID"))  # 按圈主查询
+
+    def __init__(self, name, founderID, description, establishTime):
+        self.name = name
+        self.founderID = founderID
+        self.description = description
+        self.establishTime = establishTime
+
+
+class GroupDiscussion(db.Model):
+    """圈子讨论模型"""
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    posterID = db.Column(db.Integer, unique=False)
+    groupID = db.Column(db.Integer, unique=False)
+    postTime = db.Column(db.DateTime, unique=False)
+    title = db.Column(db.String(256), unique=False)
+    content = db.Column(db.Text, unique=False)
+    isRead = db.Column(db.Boolean, nullable=False, default=False)
+    __table_args__ = (db.Index("group_discussion_group_id_fk", "groupID", "isRead"),  # 按圈子查询、未读帖子查询
+                      db.Index("group_discussion_user_id_fk", "posterID"))  # 按发帖人查询
+
+    def __init__(self, posterID, groupID, postTime, title, content):
+        self.posterID = posterID
+        self.groupID = groupID
+        self.postTime = postTime
+        self.title = title
+        self.content = content
+
+
+class GroupUser(db.Model):
+    """圈子用户关系模型"""
+    userID = db.Column(db.Integer, unique=False)
+    groupID = db.Column(db.Integer, unique=False)
+    __table_args__ = (db.PrimaryKeyConstraint('userID', 'groupID'),  # 联合主键
+                      db.Index("group_user_group_id_fk", "groupID"))  # 联合主键以userID开头，按圈子查询成员需单独索引
+    joinTime = db.Column(db.DateTime, unique=False)
+
+    def __init__(self, userID, groupID, joinTime):
+        self.userID = userID
+        self.groupID = groupID
+        self.joinTime = joinTime
+
+
+class GroupDiscussionReply(db.Model):
+    """圈子讨论回复模型"""
+    authorID = db.Column(db.Integer, unique=False)
+    discussionID = db.Column(db.Integer, unique=False)
+    replyTime = db.Column(db.DateTime, unique=False)
+    __table_args__ = (db.PrimaryKeyConstraint('authorID', 'discussionID', 'replyTime'),  # 联合主键
+                      db.Index("discuss_reply_discuss_id_fk", "discussionID", "isRead"))  # 未读回复查询
+    content = db.Column(db.Text, unique=False)
+    isRead = db.Column(db.Boolean, nullable=False, default=False)
+
+    def __init__(self, authorID, discussionID, replyTime, content):
+        self.authorID = authorID
+        self.discussionID = discussionID
+        self.replyTime = replyTime
+        self.content = content
+
+
+class Error(db.Model):
+    """错误信息模型"""
+    errorCode = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    title = db.Column(db.String(128), unique=False)
+    title_en = db.Column(db.String(128), unique=False)
+    content = db.Column(db.Text, unique=False)
+    publishTime = db.Column(db.DateTime, unique=False)
+    authorID = db.Column(db.Integer, unique=False)
+    referenceLink = db.Column(db.String(128), unique=False)
+
+    def __init__(self, title, title_en, content, publishTime, authorID, referenceLink):
+        self.title = title
+        self.title_en = title_en
+        self.content = content
+        self.publishTime = publishTime
+        self.authorID = authorID
+        self.referenceLink = referenceLink
+
+
+class Chat(db.Model):
+    """聊天消息模型"""
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    senderID = db.Column(db.Integer, nullable=False)
+    receiverID = db.Column(db.Integer, nullable=False)
+    content = db.Column(db.Text, nullable=False)
+    sendTime = db.Column(db.DateTime, nullable=False)
+    isRead = db.Column(db.Boolean, nullable=False, default=False)
+    __table_args__ = (db.Index("chat_user_id_fk", "senderID"),  # 按发送者查询
+                      db.Index("chat_user_id_fk2", "receiverID", "isRead"))  # 未读私信查询
+
+    def __init__(self, senderID, receiverID, content, sendTime):
+        self.senderID = senderID
+        self.receiverID = receiverID
+        self.content = content
+        self.sendTime = sendTime
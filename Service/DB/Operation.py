@@ -1,13 +1,110 @@
 from datetime import datetime
+from functools import lru_cache
 
 from flask import Flask
-from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import func, inspect, select
+from sqlalchemy.dialects.mysql import match
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import load_only
 from werkzeug.security import generate_password_hash, check_password_hash
 
-from typing import Optional
+from typing import Optional, Union
 from Service.DB.ExtractInfo import *
+from Service.DB.Models import db, User, Book, Journal, JournalComment, JournalLike, Group, GroupDiscussion, \
+    GroupUser, GroupDiscussionReply, Error, Chat
+from Service.cache import TTLCache
 from Service.utils import getConfig
 
+_userCache = TTLCache(maxSize=4096, ttl=60)  # getUser的结果缓存，用户信息被修改时失效
+_bookCache = TTLCache(maxSize=4096, ttl=300)  # getBook的结果缓存，书籍信息被修改时失效
+_unreadCache = TTLCache(maxSize=4096, ttl=30)  # getAllUnreadMessageNum的结果缓存，消息被新增或标记已读时清空
+_PASSWORD_METHOD = "scrypt"  # 密码哈希算法，登录时会把其他算法生成的旧哈希升级为该算法
+_ER_DUP_ENTRY = 1062  # MySQL错误码：唯一键（主键）冲突
+_YIELD_PER = 500  # 全表列表分批读取时每批的行数
+_NGRAM_TOKEN_SIZE = 2  # MySQL ngram全文解析器的分词长度(ngram_token_size)，短于该长度的关键字无法走全文索引
+
+
+def _countStatement(model, *criteria):
+    """
+    构造统计满足条件的记录数的语句
+
+    Args:
+        model: 数据模型类
+        *criteria: 过滤条件
+
+    Returns:
+        Select: SELECT count(*) FROM 表 WHERE ... 语句，也可以作为标量子查询嵌入其他语句
+    """
+    return select(func.count()).select_from(model).where(*criteria)
+
+
+def _count(model, *criteria) -> int:
+    """
+    统计满足条件的记录数
+
+    Args:
+        model: 数据模型类
+        *criteria: 过滤条件
+
+    Returns:
+        int: 记录数
+
+    Note:
+        直接生成SELECT count(*) FROM 表 WHERE ...，
+        不像Query.count()那样把原查询包成子查询再计数
+    """
+    return model.query.session.scalar(_countStatement(model, *criteria))
+
+
+@lru_cache(maxsize=None)
+def _fulltextIndexes(bind, tableName: str) -> frozenset:
+    """
+    查询表上已建立的ngram FULLTEXT索引，每个连接引擎和表只查询一次
+
+    Args:
+        bind: 数据库连接引擎
+        tableName: 表名
+
+    Returns:
+        frozenset: 各ngram FULLTEXT索引的列名元组；默认解析器按空白分词，无法匹配中文，不计入
+
+    Note:
+        结果在进程内缓存，执行migrate_fulltext.sql添加索引后需要重启应用才会改用全文索引
+    """
+    indexes = inspect(bind).get_indexes(tableName)
+    return frozenset(tuple(index["column_names"]) for index in indexes
+                     if index.get("dialect_options", {}).get("mysql_prefix") == "FULLTEXT"
+                     and index["dialect_options"].get("mysql_with_parser") == "ngram")
+
+
+def _keywordFilter(query, keyword: str, *columns):
+    """
+    构造关键字搜索条件
+
+    Args:
+        query: 待搜索的查询对象，用于判断当前数据库类型
+        keyword: 搜索关键字
+        *columns: 参与匹配的列，MySQL下与某个FULLTEXT索引的列完全一致时才会使用该索引
+
+    Returns:
+        搜索条件，任一列包含关键字即匹配
+
+    Note:
+        结果始终与LIKE "%关键字%"一致。以下条件都满足时，先用FULLTEXT索引(MATCH ... AGAINST短语匹配)筛选候选行，
+        再对候选行做LIKE匹配，不必扫描全表：
+        - 数据库为MySQL，且这些列上确实建有ngram FULLTEXT索引（旧库需先执行migrate_fulltext.sql，建索引时须关闭停用词）
+        - 关键字不短于ngram分词长度，且只由文字和数字组成；ngram会丢弃空白和标点，含有它们的关键字无法按短语匹配
+        否则只使用LIKE，全表扫描
+    """
+    condition = columns[0].like(f"%{keyword}%")
+    for column in columns[1:]:
+        condition = condition | column.like(f"%{keyword}%")
+    bind = query.session.get_bind()
+    if len(keyword) >= _NGRAM_TOKEN_SIZE and keyword.isalnum() and bind.dialect.name == "mysql" \
+            and tuple(column.name for column in columns) in _fulltextIndexes(bind, columns[0].table.name):
+        condition = match(*columns, against=f'"{keyword}"').in_boolean_mode() & condition
+    return condition
+
 
 class Database:
     """
@@ -28,7 +125,7 @@ class Database:
     - modify__(): 修改记录
     - delete__(): 删除记录
 
-    对于需要时间戳的操作，可以传入datetime对象，否则会自动使用当前时间。
+    对于需要时间戳的操作，可以传入datetime对象，否则会自动使用当前时间（直接以datetime对象写入，精确到秒）。
     """
 
     def __init__(self, app: Flask):
@@ -40,9 +137,8 @@ class Database:
 
         初始化过程：
         1. 从配置文件读取数据库连接信息
-        2. 构建数据库连接URI
-        3. 初始化SQLAlchemy实例
-        4. 附加数据模型
+        2. 构建数据库连接URI并配置连接池
+        3. 将模块级的SQLAlchemy实例（及其上定义的数据模型）绑定到该应用
         """
         info = getConfig("Database")
         client = f"{info['Type'].lower()}+{info['Driver']}"
@@ -53,8 +149,16 @@ class Database:
         database = info["Database"]
         URI = f"{client}://{account}:{password}@{host}:{port}/{database}"
         app.config["SQLALCHEMY_DATABASE_URI"] = URI
-        self.db = SQLAlchemy(app)
-        self._attachModel()
+        # 连接池：复用已建立的连接，取用前探活，并在MySQL的wait_timeout之前主动回收
+        app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
+            "pool_size": info.get("PoolSize", 10),
+            "max_overflow": info.get("MaxOverflow", 20),
+            "pool_recycle": info.get("PoolRecycle", 1800),
+            "pool_pre_ping": True,
+            "pool_use_lifo": True,
+        }
+        db.init_app(app)
+        self.db = db
 
     """用户相关操作"""
 
@@ -77,18 +181,20 @@ class Database:
 
         Note:
             - 邮箱和电话如果为空字符串，将被设置为None
-            - 密码会使用werkzeug.security进行加密存储
+            - 密码会使用werkzeug.security的scrypt算法进行加密存储
             - 会自动记录用户的最后登录时间
         """
         email = None if email == "" else email
         telephone = None if telephone == "" else telephone
-        user = User(account=account, password=generate_password_hash(password), signature="",
+        user = User(account=account, password=generate_password_hash(password, _PASSWORD_METHOD), signature="",
                     email=email, telephone=telephone, role=role,
-                    lastLoginTime=datetime.strftime(datetime.now(), '%Y-%m-%d %H:%M:%S'))
+                    lastLoginTime=datetime.now().replace(microsecond=0))
         self.db.session.add(user)
+        self.db.session.flush()  # flush后主键已回填，commit后再读取会触发一次刷新查询
+        userID = user.id
         self.db.session.commit()
 
-        return user.id
+        return userID
 
     def modifyUser(self, userID: int, **kwargs):
         """
@@ -116,6 +222,7 @@ class Database:
             if hasattr(user, key):
                 setattr(user, key, kwargs[key])
         self.db.session.commit()
+        _userCache.invalidate(f"user:{userID}:True", f"user:{userID}:False")
         return True
 
     def modifyUserByAccount(self, account: str, password):
@@ -131,8 +238,29 @@ class Database:
             - 如果用户不存在，将抛出异常
         """
         user = User.query.filter_by(account=account).first()
-        user.password = generate_password_hash(password)
+        user.password = generate_password_hash(password, _PASSWORD_METHOD)
+        userID = user.id
         self.db.session.commit()
+        _userCache.invalidate(f"user:{userID}:True", f"user:{userID}:False")
+
+    @staticmethod
+    def _queryUser(withPasswd=False):
+        """
+        构造只加载展示所需列的用户查询
+
+        Args:
+            withPasswd: 是否同时加载密码列
+
+        Returns:
+            Query: 用户查询对象，lastLoginTime（以及不需要时的password）不会被SELECT
+
+        Note:
+            被省略的列仍可按需访问，SQLAlchemy会在首次访问时再单独加载
+        """
+        columns = [User.id, User.account, User.signature, User.email, User.telephone, User.role]
+        if withPasswd:
+            columns.append(User.password)
+        return User.query.options(load_only(*columns))
 
     @staticmethod
     def getUser(userID: object, withPasswd: object = False) -> Optional[dict]:
@@ -147,12 +275,19 @@ class Database:
 
         Returns:
             Optional[dict]: 用户信息字典，如果用户不存在则返回None
-        """
-        info = User.query.filter_by(id=userID).first()
-        if not info:
-            return None
-        else:
-            return extractUser(info, withPasswd)
+
+        Note:
+            结果会在进程内缓存60秒，modifyUser/modifyUserByAccount会使对应缓存失效
+        """
+        key = f"user:{userID}:{bool(withPasswd)}"
+        user = _userCache.get(key)
+        if user is None:
+            info = Database._queryUser(withPasswd).filter_by(id=userID).first()
+            if not info:
+                return None
+            user = extractUserWithPassword(info) if withPasswd else extractUser(info)
+            _userCache.set(key, user)
+        return user.copy()  # 返回副本，避免调用方修改缓存内容
 
     @staticmethod
     def searchUser(keyword, withPasswd=False) -> list[dict]:
@@ -168,11 +303,12 @@ class Database:
         Returns:
             list[dict]: 匹配的用户信息列表，如果没有匹配则返回空列表
         """
-        users = User.query.filter(User.account.like(f"%{keyword}%")).all()
+        users = Database._queryUser(withPasswd).filter(User.account.like(f"%{keyword}%")).all()
         if not users:
             return []
         else:
-            return [extractUser(info, withPasswd) for info in users]
+            extract = extractUserWithPassword if withPasswd else extractUser
+            return [extract(info) for info in users]
 
     @staticmethod
     def getAllUser(withPasswd=False) -> list[dict]:
@@ -187,11 +323,8 @@ class Database:
         Returns:
             list[dict]: 所有用户的信息列表，如果没有用户则返回空列表
         """
-        infoList = User.query.all()
-        if not infoList:
-            return []
-        else:
-            return [extractUser(info, withPasswd) for info in infoList]
+        extract = extractUserWithPassword if withPasswd else extractUser
+        return [extract(info) for info in Database._queryUser(withPasswd).yield_per(_YIELD_PER)]
 
     @staticmethod
     def getUserByAccount(account: str, withPasswd=False) -> Optional[dict]:
@@ -207,11 +340,11 @@ class Database:
         Returns:
             Optional[dict]: 用户信息字典，如果用户不存在则返回None
         """
-        info = User.query.filter_by(account=account).first()
+        info = Database._queryUser(withPasswd).filter_by(account=account).first()
         if not info:
             return None
         else:
-            return extractUser(info, withPasswd)
+            return extractUserWithPassword(info) if withPasswd else extractUser(info)
 
     @staticmethod
     def getAllUserByAccount(account: str, withPasswd=False) -> list[dict]:
@@ -227,11 +360,43 @@ class Database:
         Returns:
             list[dict]: 匹配的用户信息列表，如果没有匹配则返回空列表
         """
-        infoList = User.query.filter_by(account=account).all()
+        infoList = Database._queryUser(withPasswd).filter_by(account=account).all()
         if not infoList:
             return []
         else:
-            return [extractUser(info, withPasswd) for info in infoList]
+            extract = extractUserWithPassword if withPasswd else extractUser
+            return [extract(info) for info in infoList]
+
+    @staticmethod
+    def getAccounts(userID) -> dict[int, str]:
+        """
+        批量获取用户名
+
+        Args:
+            userID: 用户ID的集合（或列表）
+
+        Returns:
+            dict[int, str]: 以用户ID为键、用户名为值的字典，不存在的用户不会出现在其中
+        """
+        if not userID:
+            return {}
+        return dict(User.query.with_entities(User.id, User.account).filter(User.id.in_(userID)).all())
+
+    @staticmethod
+    def _getCredential(account: str):
+        """
+        获取登录验证所需的用户ID和密码哈希
+
+        Args:
+            account: 用户名
+
+        Returns:
+            Optional[Row]: (id, password)二元组，用户不存在时返回None
+
+        Note:
+            只查询这两列且不构造User对象；account字段唯一，至多一条记录
+        """
+        return User.query.with_entities(User.id, User.password).filter(User.account == account).one_or_none()
 
     def checkLogin(self, account, password):
         """
@@ -245,19 +410,41 @@ class Database:
             Union[int, bool]: 
                 - 如果验证成功，返回用户ID
                 - 如果验证失败，返回False
+
+        Note:
+            验证成功时，若密码哈希不是由当前算法(scrypt)生成的，会顺便用当前算法重新哈希并保存
         """
-        usersInfo = self.getAllUserByAccount(account, withPasswd=True)
-        if len(usersInfo) == 0:
+        credential = self._getCredential(account)
+        if not credential:
             return False
-        else:
-            for info in usersInfo:
-                if check_password_hash(info["password"], password):
-                    return info["id"]
-            else:
-                return False
+        userID, passwordHash = credential
+        if not check_password_hash(passwordHash, password):
+            return False
+        if not passwordHash.startswith(_PASSWORD_METHOD + ":"):  # 旧算法的哈希，趁拿到明文时重新哈希
+            User.query.filter_by(id=userID).update({"password": generate_password_hash(password, _PASSWORD_METHOD)},
+                                                   synchronize_session=False)
+            self.db.session.commit()
+            _userCache.invalidate(f"user:{userID}:True")
+        return userID
 
     """日志相关操作"""
 
+    @staticmethod
+    def _queryJournalWithNum():
+        """
+        构造附带点赞数、评论数的日志查询
+
+        Returns:
+            Query: 每行为(journal, likeNum, commentNum)的查询对象
+
+        Note:
+            点赞数和评论数以关联子查询的形式放在SELECT列表中，一次查询即可取回，
+            避免对每篇日志再各发两条COUNT语句
+        """
+        likeNum = select(func.count()).where(JournalLike.journalID == Journal.id).correlate(Journal)
+        commentNum = select(func.count()).where(JournalComment.journalID == Journal.id).correlate(Journal)
+        return Journal.query.add_columns(likeNum.scalar_subquery(), commentNum.scalar_subquery())
+
     @staticmethod
     def getJournal(journalID: int):
         """
@@ -272,9 +459,7 @@ class Database:
                 - 点赞数
                 - 评论数
         """
-        journal = Journal.query.filter_by(id=journalID).first()
-        likeNum = JournalLike.query.filter_by(journalID=journal.id).count()
-        commentNum = JournalComment.query.filter_by(journalID=journal.id).count()
+        journal, likeNum, commentNum = Database._queryJournalWithNum().filter(Journal.id == journalID).first()
         return extractJournal(journal, likeNum, commentNum)
 
     @staticmethod
@@ -288,13 +473,11 @@ class Database:
         Returns:
             dict[dict]: 以日志ID为键的日志信息字典
         """
-        journals = Journal.query.filter(Journal.id.in_(journalID)).all()
-        res = {}
-        for journal in journals:
-            likeNum = JournalLike.query.filter_by(journalID=journal.id).count()
-            commentNum = JournalComment.query.filter_by(journalID=journal.id).count()
-            res[journal.id] = extractJournal(journal, likeNum, commentNum)
-        return res
+        if not journalID:
+            return {}
+        journals = Database._queryJournalWithNum().filter(Journal.id.in_(journalID)).all()
+        return {journal.id: extractJournal(journal, likeNum, commentNum, lean=True)
+                for journal, likeNum, commentNum in journals}
 
     @staticmethod
     def getAllJournalByAuthorID(authorID: int = None, limit=None) -> list[dict]:
@@ -308,21 +491,13 @@ class Database:
         Returns:
             list[dict]: 日志信息列表，按发布时间降序排列
         """
-        if authorID is None and limit is None:  # 按时间降序排列
-            journals = Journal.query.order_by(Journal.publishTime.desc()).all()
-        elif authorID is None and limit is not None:
-            journals = Journal.query.order_by(Journal.publishTime.desc()).limit(limit).all()
-        elif authorID is not None and limit is None:
-            journals = Journal.query.filter_by(authorID=authorID).order_by(Journal.publishTime.desc()).all()
-        else:
-            journals = Journal.query.filter_by(authorID=authorID).order_by(Journal.publishTime.desc()).limit(
-                limit).all()
-        res = []
-        for journal in journals:
-            likeNum = JournalLike.query.filter_by(journalID=journal.id).count()
-            commentNum = JournalComment.query.filter_by(journalID=journal.id).count()
-            res.append(extractJournal(journal, likeNum, commentNum))
-        return res
+        query = Database._queryJournalWithNum()
+        if authorID is not None:
+            query = query.filter(Journal.authorID == authorID)
+        query = query.order_by(Journal.publishTime.desc())  # 按时间降序排列
+        if limit is not None:
+            query = query.limit(limit)
+        return [extractJournal(journal, likeNum, commentNum, lean=True) for journal, likeNum, commentNum in query.all()]
 
     @staticmethod
     def getAllJournal():
@@ -331,14 +506,32 @@ class Database:
 
         Returns:
             list[dict]: 所有日志的信息列表，按发布时间降序排列
+
+        Note:
+            以yield_per分批读取并逐批转换为字典，ORM对象不会在内存中同时存在
         """
-        res = []
-        journals = Journal.query.order_by(Journal.publishTime.desc()).all()
-        for journal in journals:
-            likeNum = JournalLike.query.filter_by(journalID=journal.id).count()
-            commentNum = JournalComment.query.filter_by(journalID=journal.id).count()
-            res.append(extractJournal(journal, likeNum, commentNum))
-        return res
+        journals = Database._queryJournalWithNum().order_by(Journal.publishTime.desc()).yield_per(_YIELD_PER)
+        return [extractJournal(journal, likeNum, commentNum, lean=True) for journal, likeNum, commentNum in journals]
+
+    @staticmethod
+    def getAllJournalWithAuthor() -> list[dict]:
+        """
+        获取所有日志信息，并附带作者用户名
+
+        Returns:
+            list[dict]: 所有日志的信息列表，按发布时间降序排列，每项额外包含account（作者用户名）
+
+        Note:
+            作者用户名通过JOIN用户表与日志在同一条查询中取回
+        """
+        journals = Database._queryJournalWithNum().join(User, User.id == Journal.authorID).add_columns(User.account)
+        journals = journals.order_by(Journal.publishTime.desc()).yield_per(_YIELD_PER)
+        results = []
+        for journal, likeNum, commentNum, account in journals:
+            info = extractJournal(journal, likeNum, commentNum, lean=True)
+            info["account"] = account
+            results.append(info)
+        return results
 
     @staticmethod
     def searchJournal(keyword: str) -> list[dict]:
@@ -351,46 +544,41 @@ class Database:
         Returns:
             list[dict]: 匹配的日志信息列表
         """
-        journalsInfo = Journal.query.filter(
-            Journal.title.like("%" + keyword + "%") | Journal.content.like("%" + keyword + "%")).all()
-        res = []
-        for journal in journalsInfo:
-            likeNum = JournalLike.query.filter_by(journalID=journal.id).count()
-            commentNum = JournalComment.query.filter_by(journalID=journal.id).count()
-            res.append({"id": journal.id,
-                        "title": journal.title,
-                        "firstParagraph": journal.firstParagraph,
-                        "content": journal.content,
-                        "publishTime": journal.publishTime,
-                        "authorID": journal.authorID,
-                        "bookID": journal.bookID,
-                        "likeNum": likeNum,
-                        "commentNum": commentNum})
-        return res
+        query = Database._queryJournalWithNum()
+        journalsInfo = query.filter(_keywordFilter(query, keyword, Journal.title, Journal.content)).all()
+        return [extractJournal(journal, likeNum, commentNum, lean=True)
+                for journal, likeNum, commentNum in journalsInfo]
 
-    def addJournal(self, title: str, content: list, publishTime: str, authorID: int, bookID: int) -> int:
+    def addJournal(self, title: str, content: Union[str, list], publishTime: str, authorID: int, bookID: int) -> int:
         """
         添加新日志
 
         Args:
             title: 日志标题
-            content: 日志内容列表，第一段将作为firstParagraph
+            content: 日志内容，可以是以"\n"分段的字符串，也可以是段落列表；第一段将作为firstParagraph
             publishTime: 发布时间
             authorID: 作者ID
             bookID: 相关书籍ID
 
         Returns:
             int: 新创建的日志ID
+
+        Note:
+            数据库中以"\n"连接的文本存储，传入字符串时直接写入，不再分割后重新连接
         """
+        if not isinstance(content, str):
+            content = "\n".join(content)
         journal = Journal(title=title,
-                          firstParagraph=content[0],
-                          content="\n".join(content),
+                          firstParagraph=content.partition("\n")[0],
+                          content=content,
                           publishTime=publishTime,
                           authorID=authorID,
                           bookID=bookID)
         self.db.session.add(journal)
+        self.db.session.flush()
+        journalID = journal.id
         self.db.session.commit()
-        return Journal.query.filter_by(title=title, authorID=authorID).first().id
+        return journalID
 
     def markAllJournalCommentAsRead(self, journalID: int):
         """
@@ -399,8 +587,11 @@ class Database:
         Args:
             journalID: 日志ID
         """
-        JournalComment.query.filter_by(journalID=journalID).update({"isRead": True})
+        # 只更新未读的行，已读的行不再重复写入；(journalID, isRead)复合索引可直接定位这些行
+        JournalComment.query.filter_by(journalID=journalID, isRead=False).update({"isRead": True},
+                                                                                 synchronize_session=False)
         self.db.session.commit()
+        _unreadCache.clear()
 
     @staticmethod
     def getJournalComments(journalID) -> list[dict]:
@@ -433,10 +624,11 @@ class Database:
             bool: 添加是否成功
         """
         if not publishTime:
-            publishTime = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            publishTime = datetime.now().replace(microsecond=0)
         comment = JournalComment(content=content, publishTime=publishTime, authorID=authorID, journalID=journalID)
         self.db.session.add(comment)
         self.db.session.commit()
+        _unreadCache.clear()
         return True
 
     @staticmethod
@@ -450,7 +642,7 @@ class Database:
         Returns:
             int: 点赞数
         """
-        return JournalLike.query.filter_by(journalID=journalID).count()
+        return _count(JournalLike, JournalLike.journalID == journalID)
 
     def addJournalLike(self, journalID, authorID) -> bool:
         """
@@ -464,15 +656,22 @@ class Database:
             bool: 添加是否成功
                 - True: 添加成功
                 - False: 已经点赞过
+
+        Raises:
+            IntegrityError: 日志或用户不存在（违反外键约束）等非重复点赞的完整性错误
         """
-        publishTime = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        if JournalLike.query.filter_by(journalID=journalID, authorID=authorID).first():
-            return False
-        else:
-            like = JournalLike(journalID=journalID, authorID=authorID, publishTime=publishTime)
-            self.db.session.add(like)
+        publishTime = datetime.now().replace(microsecond=0)
+        like = JournalLike(journalID=journalID, authorID=authorID, publishTime=publishTime)
+        self.db.session.add(like)
+        try:
             self.db.session.commit()
-            return True
+        except IntegrityError as e:
+            self.db.session.rollback()
+            # (authorID, journalID)为联合主键，只有主键冲突才是重复点赞；其他错误（如外键约束）交给调用方
+            if e.orig.args and e.orig.args[0] == _ER_DUP_ENTRY:
+                return False
+            raise
+        return True
 
     """书籍相关操作"""
 
@@ -487,11 +686,10 @@ class Database:
         Returns:
             list[dict]: 匹配的书籍信息列表，按豆瓣评分降序排列
         """
-        booksInfo = Book.query.filter(
-            Book.title.like(f"%{keyword}%") | Book.author.like(f"%{keyword}%")).order_by(
+        booksInfo = Book.query.filter(_keywordFilter(Book.query, keyword, Book.title, Book.author)).order_by(
             Book.doubanScore.desc()).all()
 
-        return [extractBook(book) for book in booksInfo]
+        return extractBooks(booksInfo)
 
     @staticmethod
     def getBook(bookID: int):
@@ -503,9 +701,15 @@ class Database:
 
         Returns:
             dict: 书籍信息字典
+
+        Note:
+            结果会在进程内缓存300秒，modifyBook会使对应缓存失效
         """
-        book = Book.query.filter_by(id=bookID).first()
-        return extractBook(book)
+        book = _bookCache.get(bookID)
+        if book is None:
+            book = extractBook(Book.query.filter_by(id=bookID).first())
+            _bookCache.set(bookID, book)
+        return book.copy()  # 返回副本，避免调用方修改缓存内容
 
     def modifyBook(self, bookID: int, **kwargs):
         """
@@ -527,6 +731,7 @@ class Database:
             if hasattr(book, key):
                 setattr(book, key, value)
         self.db.session.commit()
+        _bookCache.invalidate(bookID)
         return True
 
     @staticmethod
@@ -540,11 +745,12 @@ class Database:
         Returns:
             list[dict]: 书籍信息列表，按出版日期降序排列
         """
-        if not limit:
-            books = Book.query.filter_by().order_by(Book.publishDate.desc()).all()
+        query = Book.query.order_by(Book.publishDate.desc())
+        if limit:
+            query = query.limit(limit)
         else:
-            books = Book.query.filter_by().order_by(Book.publishDate.desc()).limit(limit).all()
-        return [extractBook(book) for book in books]
+            query = query.yield_per(_YIELD_PER)  # 不限数量时分批读取，避免一次性缓冲整张表
+        return extractBooksBulk(query)
 
     """圈子相关操作"""
 
@@ -562,11 +768,13 @@ class Database:
             int: 新创建的圈子ID
         """
         if not establishTime:
-            establishTime = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            establishTime = datetime.now().replace(microsecond=0)
         group = Group(name=name, description=description, founderID=founderID, establishTime=establishTime)
         self.db.session.add(group)
+        self.db.session.flush()
+        groupID = group.id
         self.db.session.commit()
-        return Group.query.filter_by(name=name, founderID=founderID, establishTime=establishTime).first().id
+        return groupID
 
     @staticmethod
     def getGroup(groupID: int) -> dict:
@@ -582,6 +790,22 @@ class Database:
         group = Group.query.filter_by(id=groupID).first()
         return extractGroup(group)
 
+    @staticmethod
+    def getAllGroupByID(groupID: list) -> dict[dict]:
+        """
+        批量获取多个圈子的详细信息
+
+        Args:
+            groupID: 圈子ID列表
+
+        Returns:
+            dict[dict]: 以圈子ID为键的圈子信息字典，不存在的圈子不会出现在其中
+        """
+        if not groupID:
+            return {}
+        groups = Group.query.filter(Group.id.in_(groupID)).all()
+        return {group["id"]: group for group in extractGroups(groups)}
+
     def modifyGroup(self, groupID: int, **kwargs):
         """
         修改圈子信息
@@ -613,7 +837,27 @@ class Database:
             list[dict]: 圈子信息列表
         """
         groups = Group.query.filter_by().all()
-        return [extractGroup(group) for group in groups]
+        return extractGroups(groups)
+
+    @staticmethod
+    def getAllGroupWithNum() -> list[dict]:
+        """
+        获取所有圈子信息，并附带成员数量和帖子数量
+
+        Returns:
+            list[dict]: 圈子信息列表，每项额外包含userNum（成员数量）和discussionNum（帖子数量）
+
+        Note:
+            两个数量以关联子查询的形式放在SELECT列表中，一次查询即可取回
+        """
+        userNum = select(func.count()).where(GroupUser.groupID == Group.id).correlate(Group)
+        discussionNum = select(func.count()).where(GroupDiscussion.groupID == Group.id).correlate(Group)
+        rows = Group.query.add_columns(userNum.scalar_subquery(), discussionNum.scalar_subquery()).all()
+        groups = extractGroups(row[0] for row in rows)
+        for group, (_, groupUserNum, groupDiscussionNum) in zip(groups, rows):
+            group["userNum"] = groupUserNum
+            group["discussionNum"] = groupDiscussionNum
+        return groups
 
     @staticmethod
     def searchGroup(keyword: str) -> list[dict]:
@@ -626,9 +870,8 @@ class Database:
         Returns:
             list[dict]: 匹配的圈子信息列表
         """
-        groups = Group.query.filter(
-            Group.name.like(f"%{keyword}%") | Group.description.like(f"%{keyword}%")).all()
-        return [extractGroup(group) for group in groups]
+        groups = Group.query.filter(_keywordFilter(Group.query, keyword, Group.name, Group.description)).all()
+        return extractGroups(groups)
 
     """圈子内的帖子相关操作"""
 
@@ -641,10 +884,18 @@ class Database:
             groupID: 圈子ID
 
         Returns:
-            list[dict]: 帖子信息列表，按发布时间降序排列
+            list[dict]: 帖子信息列表，按发布时间降序排列，每条帖子额外包含回复数repliesNum
         """
-        discussions = GroupDiscussion.query.filter_by(groupID=groupID).order_by(GroupDiscussion.postTime.desc()).all()
-        return [extractGroupDiscussion(discussion) for discussion in discussions]
+        repliesNum = select(func.count()).where(
+            GroupDiscussionReply.discussionID == GroupDiscussion.id).correlate(GroupDiscussion)
+        discussions = GroupDiscussion.query.add_columns(repliesNum.scalar_subquery()).filter(
+            GroupDiscussion.groupID == groupID).order_by(GroupDiscussion.postTime.desc()).all()
+        res = []
+        for discussion, num in discussions:
+            discussion = extractGroupDiscussion(discussion)
+            discussion["repliesNum"] = num
+            res.append(discussion)
+        return res
 
     def markAllDiscussionAsRead(self, groupID: int):
         """
@@ -653,8 +904,10 @@ class Database:
         Args:
             groupID: 圈子ID
         """
-        GroupDiscussion.query.filter_by(groupID=groupID).update({"isRead": True})
+        GroupDiscussion.query.filter_by(groupID=groupID, isRead=False).update({"isRead": True},
+                                                                              synchronize_session=False)
         self.db.session.commit()
+        _unreadCache.clear()
 
     def addGroupDiscussion(self, posterID: int, groupID: int, postTime: str, title: str, content: str)->int:
         """
@@ -673,8 +926,11 @@ class Database:
         discussion = GroupDiscussion(posterID=posterID, groupID=groupID, postTime=postTime, title=title,
                                      content=content)
         self.db.session.add(discussion)
+        self.db.session.flush()
+        discussionID = discussion.id
         self.db.session.commit()
-        return GroupDiscussion.query.filter_by(posterID=posterID, groupID=groupID, postTime=postTime).first().id
+        _unreadCache.clear()
+        return discussionID
 
     @staticmethod
     def getGroupDiscussion(discussID: int) -> dict:
@@ -690,6 +946,22 @@ class Database:
         discussion = GroupDiscussion.query.filter_by(id=discussID).first()
         return extractGroupDiscussion(discussion)
 
+    @staticmethod
+    def getAllGroupDiscussionByID(discussID: list) -> dict[dict]:
+        """
+        批量获取多个帖子的详细信息
+
+        Args:
+            discussID: 帖子ID列表
+
+        Returns:
+            dict[dict]: 以帖子ID为键的帖子信息字典，不存在的帖子不会出现在其中
+        """
+        if not discussID:
+            return {}
+        discussions = GroupDiscussion.query.filter(GroupDiscussion.id.in_(discussID)).all()
+        return {discussion.id: extractGroupDiscussion(discussion) for discussion in discussions}
+
     def deleteGroupDiscussion(self, discussID: int) -> bool:
         """
         删除指定帖子
@@ -707,6 +979,7 @@ class Database:
             return False
         self.db.session.delete(discussion)
         self.db.session.commit()
+        _unreadCache.clear()
         return True
 
     """帖子的回复相关操作"""
@@ -725,10 +998,11 @@ class Database:
             bool: 添加是否成功
         """
         if not replyTime:
-            replyTime = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            replyTime = datetime.now().replace(microsecond=0)
         reply = GroupDiscussionReply(authorID=authorID, discussionID=discussionID, replyTime=replyTime, content=content)
         self.db.session.add(reply)
         self.db.session.commit()
+        _unreadCache.clear()
         return True
 
     @staticmethod
@@ -757,7 +1031,7 @@ class Database:
         Returns:
             int: 回复数量
         """
-        return GroupDiscussionReply.query.filter_by(discussionID=discussionID).count()
+        return _count(GroupDiscussionReply, GroupDiscussionReply.discussionID == discussionID)
 
     def markAllDiscussionReplyAsRead(self, discussionID: int):
         """
@@ -766,8 +1040,10 @@ class Database:
         Args:
             discussionID: 帖子ID
         """
-        GroupDiscussionReply.query.filter_by(discussionID=discussionID).update({"isRead": True})
+        GroupDiscussionReply.query.filter_by(discussionID=discussionID, isRead=False).update({"isRead": True},
+                                                                                            synchronize_session=False)
         self.db.session.commit()
+        _unreadCache.clear()
 
     @staticmethod
     def getGroupReplies(groupID: int, limit=5) -> list[dict]:
@@ -781,9 +1057,9 @@ class Database:
         Returns:
             list[dict]: 回复信息列表，按回复时间降序排列
         """
-        discussionID = [discussion.id for discussion in GroupDiscussion.query.filter_by(groupID=groupID).all()]
-        replies = GroupDiscussionReply.query.filter(GroupDiscussionReply.discussionID.in_(discussionID)).order_by(
-            GroupDiscussionReply.replyTime.desc()).limit(limit).all()
+        replies = GroupDiscussionReply.query.join(
+            GroupDiscussion, GroupDiscussion.id == GroupDiscussionReply.discussionID).filter(
+            GroupDiscussion.groupID == groupID).order_by(GroupDiscussionReply.replyTime.desc()).limit(limit).all()
         return [extractGroupDiscussionReply(reply) for reply in replies]
 
     """圈子成员相关操作"""
@@ -813,7 +1089,7 @@ class Database:
         Returns:
             int: 成员数量
         """
-        return GroupUser.query.filter_by(groupID=groupID).count()
+        return _count(GroupUser, GroupUser.groupID == groupID)
 
     @staticmethod
     def getGroupDiscussionNum(groupID: int) -> int:
@@ -826,7 +1102,7 @@ class Database:
         Returns:
             int: 帖子数量
         """
-        return GroupDiscussion.query.filter_by(groupID=groupID).count()
+        return _count(GroupDiscussion, GroupDiscussion.groupID == groupID)
 
     """错误响应相关操作"""
 
@@ -847,15 +1123,11 @@ class Database:
                 - publishTime: 发布时间
                 - authorID: 作者ID
                 - referenceLink: 参考链接
+
+        Note:
+            不在此处缓存，错误页面由httpResponse模块按错误码整页缓存
         """
-        error = Error.query.filter_by(errorCode=errorCode).first()
-        return {"errorCode": error.errorCode,
-                "title": error.title,
-                "title_en": error.title_en,
-                "content": error.content,
-                "publishTime": error.publishTime,
-                "authorID": error.authorID,
-                "referenceLink": error.referenceLink}
+        return extractError(Error.query.filter_by(errorCode=errorCode).first())
 
     """消息相关操作"""
 
@@ -878,31 +1150,34 @@ class Database:
                 - groupDiscussion: 圈子新帖列表
                 - discussionReply: 帖子回复列表
                 - chat: 私信列表
+
+        Note:
+            各类消息以yield_per分批读取并逐批转换为字典，ORM对象不会在内存中同时存在
         """
         # 书评回复
-        journalComments = JournalComment.query.filter_by(authorID=userID, isRead=False).all()
+        journalComments = JournalComment.query.filter_by(authorID=userID, isRead=False).yield_per(_YIELD_PER)
         journalComments = [extractJournalComment(comment) for comment in journalComments]
-        for comment in journalComments:
-            comment["account"] = self.getUser(comment["authorID"])['account']
         # 圈子新帖
-        groupID = [item.id for item in Group.query.filter_by(founderID=userID).all()]
+        groupID = select(Group.id).where(Group.founderID == userID)
         groupDiscussions = GroupDiscussion.query.filter(GroupDiscussion.groupID.in_(groupID),
-                                                        GroupDiscussion.isRead == False).all()
+                                                        GroupDiscussion.isRead == False).yield_per(_YIELD_PER)
         groupDiscussions = [extractGroupDiscussion(discussion) for discussion in groupDiscussions]
-        for discussion in groupDiscussions:
-            discussion["account"] = self.getUser(discussion["posterID"])['account']
         # 帖子回复
-        discussionID = [item.id for item in GroupDiscussion.query.filter_by(posterID=userID).all()]
+        discussionID = select(GroupDiscussion.id).where(GroupDiscussion.posterID == userID)
         discussionReplies = GroupDiscussionReply.query.filter(
-            GroupDiscussionReply.discussionID.in_(discussionID), GroupDiscussionReply.isRead == False).all()
+            GroupDiscussionReply.discussionID.in_(discussionID), GroupDiscussionReply.isRead == False
+        ).yield_per(_YIELD_PER)
         discussionReplies = [extractGroupDiscussionReply(reply) for reply in discussionReplies]
-        for reply in discussionReplies:
-            reply["account"] = self.getUser(reply["authorID"])['account']
         # 私信
-        chats = Chat.query.filter_by(receiverID=userID, isRead=False).all()
+        chats = Chat.query.filter_by(receiverID=userID, isRead=False).yield_per(_YIELD_PER)
         chats = [extractChat(chat) for chat in chats]
-        for chat in chats:
-            chat["account"] = self.getUser(chat["senderID"])['account']
+        # 一次查询取回所有相关用户的用户名
+        messages = ((journalComments, "authorID"), (groupDiscussions, "posterID"),
+                    (discussionReplies, "authorID"), (chats, "senderID"))
+        accounts = self.getAccounts({item[key] for items, key in messages for item in items})
+        for items, key in messages:
+            for item in items:
+                item["account"] = accounts.get(item[key])
         return {"journalComment": journalComments,
                 "groupDiscussion": groupDiscussions,
                 "discussionReply": discussionReplies,
@@ -928,233 +1203,33 @@ class Database:
                 - groupDiscussion: 圈子新帖数量
                 - discussionReply: 帖子回复数量
                 - chat: 私信数量
+
+        Note:
+            结果按用户缓存30秒；新增消息、删除帖子或标记已读时清空缓存
         """
+        cached = _unreadCache.get(userID)
+        if cached is not None:
+            return cached.copy()
         # 书评回复
-        journalCommentsNum = JournalComment.query.filter_by(authorID=userID, isRead=False).count()
+        journalComments = _countStatement(JournalComment, JournalComment.authorID == userID,
+                                          JournalComment.isRead == False)
         # 圈子新帖
-        groupID = [item.id for item in Group.query.filter_by(founderID=userID).all()]
-        groupDiscussionsNum = GroupDiscussion.query.filter(
-            GroupDiscussion.groupID.in_(groupID), GroupDiscussion.isRead == False).count()
+        groupID = select(Group.id).where(Group.founderID == userID)
+        groupDiscussions = _countStatement(GroupDiscussion, GroupDiscussion.groupID.in_(groupID),
+                                           GroupDiscussion.isRead == False)
         # 帖子回复
-        discussionID = [item.id for item in GroupDiscussion.query.filter_by(posterID=userID).all()]
-        discussionRepliesNum = GroupDiscussionReply.query.filter(
-            GroupDiscussionReply.discussionID.in_(discussionID), GroupDiscussionReply.isRead == False).count()
+        discussionID = select(GroupDiscussion.id).where(GroupDiscussion.posterID == userID)
+        discussionReplies = _countStatement(GroupDiscussionReply, GroupDiscussionReply.discussionID.in_(discussionID),
+                                            GroupDiscussionReply.isRead == False)
         # 私信
-        chatsNum = Chat.query.filter_by(receiverID=userID, isRead=False).count()
-        return {"journalComment": journalCommentsNum,
-                "groupDiscussion": groupDiscussionsNum,
-                "discussionReply": discussionRepliesNum,
-                "chat": chatsNum}
-
-    """数据模型定义"""
-
-    def _attachModel(self):
-        """
-        定义数据库模型类
-
-        包括以下模型：
-        - User: 用户模型
-        - Book: 书籍模型
-        - Journal: 日志模型
-        - JournalComment: 日志评论模型
-        - JournalLike: 日志点赞模型
-        - Group: 圈子模型
-        - GroupDiscussion: 圈子讨论模型
-        - GroupUser: 圈子用户关系模型
-        - GroupDiscussionReply: 圈子讨论回复模型
-        - Error: 错误信息模型
-        - Chat: 聊天消息模型
-        """
-        global User, Book, Journal, JournalComment, JournalLike, Group, GroupDiscussion, GroupUser, GroupDiscussionReply
-        global Error, Chat
-
-        class User(self.db.Model):
-            """用户模型"""
-            id = self.db.Column(self.db.Integer, primary_key=True, autoincrement=True)
-            account = self.db.Column(self.db.String(24), unique=True)
-            password = self.db.Column(self.db.String(128), unique=False)
-            signature = self.db.Column(self.db.String(128), unique=False)
-            email = self.db.Column(self.db.String(120), unique=False)
-            telephone = self.db.Column(self.db.String(11), unique=False)
-            lastLoginTime = self.db.Column(self.db.DateTime, unique=False)
-            role = self.db.Column(self.db.Enum("student", "teacher", "admin"), unique=False)
-
-            def __init__(self, account, password, signature, email, telephone, lastLoginTime, role):
-                self.account = account
-                self.password = password
-                self.signature = signature
-                self.email = email
-                self.telephone = telephone
-                self.lastLoginTime = lastLoginTime
-                self.role = role
-
-        class Book(self.db.Model):
-            """书籍模型"""
-            id = self.db.Column(self.db.Integer, primary_key=True, autoincrement=True)
-            isbn = self.db.Column(self.db.String(32), unique=True)
-            title = self.db.Column(self.db.String(128), unique=False)
-            originTitle = self.db.Column(self.db.String(128), unique=False)
-            subtitle = self.db.Column(self.db.String(128), unique=False)
-            author = self.db.Column(self.db.String(128), unique=False)
-            page = self.db.Column(self.db.Integer, unique=False)
-            publishDate = self.db.Column(self.db.String(24), unique=False)
-            publisher = self.db.Column(self.db.String(32), unique=False)
-            description = self.db.Column(self.db.Text, unique=False)
-            doubanScore = self.db.Column(self.db.Float, unique=False)
-            doubanID = self.db.Column(self.db.String(24), unique=False)
-            type = self.db.Column(
-                self.db.Enum("马列主义、毛泽东思想、邓小平理论", "哲学、宗教", "社会科学总论", "政治、法律", "军事", "经济",
-                             "文化、科学、教育、体育", "语言、文字", "文学", "艺术", "历史、地理", "自然科学总论",
-                             "数理科学和化学", "天文学、地球科学", "生物科学", "医药、卫生", "农业科学", "工业技术",
-                             "交通运输", "航空、航天", "环境科学、安全科学", "综合性图书"), unique=False)
-
-            def __init__(self, isbn, title, originTitle, subtitle, author, page, publishDate, publisher, description,
-                         doubanScore, doubanID, type):
-                self.isbn = isbn
-                self.title = title
-                self.originTitle = originTitle
-                self.subtitle = subtitle
-                self.author = author
-                self.page = page
-                self.publishDate = publishDate
-                self.publisher = publisher
-                self.description = description
-                self.doubanScore = doubanScore
-                self.doubanID = doubanID
-                self.type = type
-
-        class Journal(self.db.Model):
-            """日志模型"""
-            id = self.db.Column(self.db.Integer, primary_key=True, autoincrement=True)
-            title = self.db.Column(self.db.String(128), unique=False)
-            firstParagraph = self.db.Column(self.db.Text, unique=False)
-            content = self.db.Column(self.db.Text, unique=False)
-            publishTime = self.db.Column(self.db.DateTime, unique=False)
-            authorID = self.db.Column(self.db.Integer, unique=False)
-            bookID = self.db.Column(self.db.Integer, unique=False)
-
-            def __init__(self, title, firstParagraph, content, publishTime, authorID, bookID):
-                self.title = title
-                self.firstParagraph = firstParagraph
-                self.content = content
-                self.publishTime = publishTime
-                self.authorID = authorID
-                self.bookID = bookID
-
-        class JournalComment(self.db.Model):
-            """日志评论模型"""
-            id = self.db.Column(self.db.Integer, primary_key=True, autoincrement=True)
-            publishTime = self.db.Column(self.db.DateTime, unique=False)
-            authorID = self.db.Column(self.db.Integer, unique=False)
-            journalID = self.db.Column(self.db.Integer, unique=False)
-            content = self.db.Column(self.db.Text, unique=False)
-            isRead = self.db.Column(self.db.Boolean, nullable=False, default=False)
-
-            def __init__(self, publishTime, authorID, journalID, content):
-                self.publishTime = publishTime
-                self.authorID = authorID
-                self.journalID = journalID
-                self.content = content
-
-        class JournalLike(self.db.Model):
-            """日志点赞模型"""
-            authorID = self.db.Column(self.db.Integer, unique=False)
-            journalID = self.db.Column(self.db.Integer, unique=False)
-            __table_args__ = (self.db.PrimaryKeyConstraint('authorID', 'journalID'),)  # 让authorID和journalID作为联合主键
-            publishTime = self.db.Column(self.db.DateTime, unique=False)
-
-            def __init__(self, authorID, journalID, publishTime):
-                self.authorID = authorID
-                self.journalID = journalID
-                self.publishTime = publishTime
-
-        class Group(self.db.Model):
-            """圈子模型"""
-            id = self.db.Column(self.db.Integer, primary_key=True, autoincrement=True)
-            name = self.db.Column(self.db.String(32), unique=True)
-            founderID = self.db.Column(self.db.Integer, unique=False)
-            description = self.db.Column(self.db.Text, unique=False)
-            establishTime = self.db.Column(self.db.DateTime, unique=False)
-
-            def __init__(self, name, founderID, description, establishTime):
-                self.name = name
-                self.founderID = founderID
-                self.description = description
-                self.establishTime = establishTime
-
-        class GroupDiscussion(self.db.Model):
-            """圈子讨论模型"""
-            id = self.db.Column(self.db.Integer, primary_key=True, autoincrement=True)
-            posterID = self.db.Column(self.db.Integer, unique=False)
-            groupID = self.db.Column(self.db.Integer, unique=False)
-            postTime = self.db.Column(self.db.DateTime, unique=False)
-            title = self.db.Column(self.db.String(256), unique=False)
-            content = self.db.Column(self.db.Text, unique=False)
-            isRead = self.db.Column(self.db.Boolean, nullable=False, default=False)
-
-            def __init__(self, posterID, groupID, postTime, title, content):
-                self.posterID = posterID
-                self.groupID = groupID
-                self.postTime = postTime
-                self.title = title
-                self.content = content
-
-        class GroupUser(self.db.Model):
-            """圈子用户关系模型"""
-            userID = self.db.Column(self.db.Integer, unique=False)
-            groupID = self.db.Column(self.db.Integer, unique=False)
-            __table_args__ = (self.db.PrimaryKeyConstraint('userID', 'groupID'),)  # 联合主键
-            joinTime = self.db.Column(self.db.DateTime, unique=False)
-
-            def __init__(self, userID, groupID, joinTime):
-                self.userID = userID
-                self.groupID = groupID
-                self.joinTime = joinTime
-
-        class GroupDiscussionReply(self.db.Model):
-            """圈子讨论回复模型"""
-            authorID = self.db.Column(self.db.Integer, unique=False)
-            discussionID = self.db.Column(self.db.Integer, unique=False)
-            replyTime = self.db.Column(self.db.DateTime, unique=False)
-            __table_args__ = (self.db.PrimaryKeyConstraint('authorID', 'discussionID', 'replyTime'),)  # 联合主键
-            content = self.db.Column(self.db.Text, unique=False)
-            isRead = self.db.Column(self.db.Boolean, nullable=False, default=False)
-
-            def __init__(self, authorID, discussionID, replyTime, content):
-                self.authorID = authorID
-                self.discussionID = discussionID
-                self.replyTime = replyTime
-                self.content = content
-
-        class Error(self.db.Model):
-            """错误信息模型"""
-            errorCode = self.db.Column(self.db.Integer, primary_key=True, autoincrement=True)
-            title = self.db.Column(self.db.String(128), unique=False)
-            title_en = self.db.Column(self.db.String(128), unique=False)
-            content = self.db.Column(self.db.Text, unique=False)
-            publishTime = self.db.Column(self.db.DateTime, unique=False)
-            authorID = self.db.Column(self.db.Integer, unique=False)
-            referenceLink = self.db.Column(self.db.String(128), unique=False)
-
-            def __init__(self, title, title_en, content, publishTime, authorID, referenceLink):
-                self.title = title
-                self.title_en = title_en
-                self.content = content
-                self.publishTime = publishTime
-                self.authorID = authorID
-                self.referenceLink = referenceLink
-
-        class Chat(self.db.Model):
-            """聊天消息模型"""
-            id = self.db.Column(self.db.Integer, primary_key=True, autoincrement=True)
-            senderID = self.db.Column(self.db.Integer, nullable=False)
-            receiverID = self.db.Column(self.db.Integer, nullable=False)
-            content = self.db.Column(self.db.Text, nullable=False)
-            sendTime = self.db.Column(self.db.DateTime, nullable=False)
-            isRead = self.db.Column(self.db.Boolean, nullable=False, default=False)
-
-            def __init__(self, senderID, receiverID, content, sendTime):
-                self.senderID = senderID
-                self.receiverID = receiverID
-                self.content = content
-                self.sendTime = sendTime
+        chats = _countStatement(Chat, Chat.receiverID == userID, Chat.isRead == False)
+        # 四个计数作为标量子查询放进同一条SELECT，一次往返取回
+        statements = (journalComments, groupDiscussions, discussionReplies, chats)
+        counts = Chat.query.session.execute(select(*[stmt.scalar_subquery() for stmt in statements])).one()
+        journalCommentsNum, groupDiscussionsNum, discussionRepliesNum, chatsNum = counts
+        unread = {"journalComment": journalCommentsNum,
+                  "groupDiscussion": groupDiscussionsNum,
+                  "discussionReply": discussionRepliesNum,
+                  "chat": chatsNum}
+        _unreadCache.set(userID, unread)
+        return unread.copy()
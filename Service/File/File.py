@@ -1,8 +1,10 @@
 import re
-from os import path, listdir, remove
+from os import path, listdir, remove, stat
 
 from Service.utils import getConfig
 
+_dirIndexCache = {}  # 目录路径 -> (目录的修改时间, ID到文件名的索引)，目录内文件增删时修改时间随之改变
+
 
 class FileMgr:
     """文件管理"""
@@ -25,6 +27,94 @@ class FileMgr:
         self._groupIconPath = self._storagePath + "/" + "groupIcon"  # 群组头像
         self._errorImagePath = self._storagePath + "/" + "errorImage"  # 错误提示图片
 
+    """batch"""
+
+    @staticmethod
+    def _indexFiles(directory: str) -> dict:
+        """
+        列出目录一次，建立ID到文件名的索引
+        :param directory: 目录路径
+        :return: 以文件名第一个"."之前的部分为键、文件名为值的字典(同一ID有多个文件时取第一个)
+        目录未被修改时直接返回上次的索引，只需一次stat而不必重新列目录
+        """
+        mtime = stat(directory).st_mtime_ns  # 先于列目录读取，列目录期间发生的修改会在下次调用时被发现
+        cached = _dirIndexCache.get(directory)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        index = {}
+        for i in listdir(directory):
+            dot = i.find(".")
+            if 0 < dot < len(i) - 1:  # 与单个查找时的"{ID}\..+"规则一致
+                index.setdefault(i[:dot], i)
+        _dirIndexCache[directory] = (mtime, index)
+        return index
+
+    def _findPaths(self, directory: str, IDs, abs: bool, enableDefault: bool, absDefault: bool) -> dict:
+        """
+        批量寻找目录下各ID对应的文件路径，整个批次只列一次目录
+        :param directory: 目录路径
+        :param IDs: ID的可迭代集合
+        :param abs: 是否返回绝对路径
+        :param enableDefault: 是否允许返回默认路径(找不到的情况下)
+        :param absDefault: 默认路径是否也遵循abs参数(与对应的单个查找函数保持一致)
+        :return: 以ID为键、路径为值的字典
+        """
+        index = self._indexFiles(directory)
+        defaultPath = ""
+        if enableDefault:
+            defaultPath = directory + "/" + "default.jpg"
+            if not (abs and absDefault):
+                defaultPath = defaultPath.replace(self._projPath, "")
+        paths = {}
+        for ID in IDs:
+            name = index.get(str(ID))
+            if name:
+                absPath = directory + "/" + name
+                paths[ID] = absPath if abs else absPath.replace(self._projPath, "")
+            else:
+                paths[ID] = defaultPath
+        return paths
+
+    def getBookCoverPaths(self, bookIDs, abs=False, enableDefault=True) -> dict:
+        """
+        批量寻找书籍封面路径，用于列表页，结果与逐个调用getBookCoverPath相同
+        :param bookIDs: 书籍ID的可迭代集合
+        :param abs: 是否返回绝对路径
+        :param enableDefault: 是否允许返回默认路径(找不到的情况下)
+        :return: 以书籍ID为键、封面图路径为值的字典
+        """
+        return self._findPaths(self._bookCoverPath, bookIDs, abs, enableDefault, absDefault=False)
+
+    def getJournalHeaderPaths(self, journalIDs, abs=False, enableDefault=True) -> dict:
+        """
+        批量寻找书评封面路径，用于列表页，结果与逐个调用getJournalHeaderPath相同
+        :param journalIDs: 书评ID的可迭代集合
+        :param abs: 是否返回绝对路径
+        :param enableDefault: 是否允许返回默认路径(找不到的情况下)
+        :return: 以书评ID为键、封面图路径为值的字典
+        """
+        return self._findPaths(self._journalHeaderPath, journalIDs, abs, enableDefault, absDefault=False)
+
+    def getProfilePhotoPaths(self, userIDs, abs=False, enableDefault=True) -> dict:
+        """
+        批量寻找头像路径，用于列表页，结果与逐个调用getProfilePhotoPath相同
+        :param userIDs: 用户ID的可迭代集合
+        :param abs: 是否返回绝对路径
+        :param enableDefault: 是否允许返回默认路径
+        :return: 以用户ID为键、头像路径为值的字典
+        """
+        return self._findPaths(self._profilePhotoPath, userIDs, abs, enableDefault, absDefault=True)
+
+    def getGroupIconPaths(self, groupIDs, abs=False, enableDefault=True) -> dict:
+        """
+        批量寻找群组头像路径，用于列表页，结果与逐个调用getGroupIconPath相同
+        :param groupIDs: 群组ID的可迭代集合
+        :param abs: 是否返回绝对路径
+        :param enableDefault: 是否允许返回默认路径
+        :return: 以群组ID为键、群组头像路径为值的字典
+        """
+        return self._findPaths(self._groupIconPath, groupIDs, abs, enableDefault, absDefault=True)
+
     """book"""
 
     def getBookCoverPath(self, bookID, abs=False, enableDefault=True) -> str:
@@ -1,6 +1,11 @@
+import logging
 import os
+import struct
+from concurrent.futures import Future, ThreadPoolExecutor
 
 import cv2
+import numpy as np
+from flask import current_app, has_app_context
 
 __doc__ = """
 图像处理工具模块
@@ -11,13 +16,121 @@ __doc__ = """
    - 指定尺寸裁剪
    - 按比例裁剪
    - 正方形裁剪
+3. 后台裁剪（不阻塞请求线程）
 
 所有函数都使用OpenCV (cv2) 进行图像处理，支持常见的图像格式。
-注意：大多数裁剪操作会直接修改原图像文件。
+获取PNG和JPEG的尺寸时只解析文件头，不解码像素。
+注意：大多数裁剪操作会直接修改原图像文件；图像已符合目标尺寸时不会重新编码写回。
 """
 
 
-from typing import Tuple
+from typing import Optional, Tuple
+
+_JPEG_QUALITY = 85  # 裁剪结果的JPEG压缩质量
+_CROP_WORKERS = 2  # 后台裁剪的线程数，OpenCV编解码时会释放GIL
+_cropExecutor = ThreadPoolExecutor(max_workers=_CROP_WORKERS, thread_name_prefix="crop")
+
+
+def _read(filePath: str) -> np.ndarray:
+    """
+    读取并解码图像文件
+
+    先一次性读入文件字节再在内存中解码，相比cv2.imread支持含中文等非ASCII字符的路径。
+
+    Args:
+        filePath: 图像文件的路径
+
+    Returns:
+        np.ndarray: BGR格式的图像数组
+    """
+    return cv2.imdecode(np.fromfile(filePath, dtype=np.uint8), cv2.IMREAD_COLOR)
+
+
+def _write(filePath: str, img: np.ndarray):
+    """
+    编码图像并一次性写入文件，编码格式由文件扩展名决定
+
+    Args:
+        filePath: 目标文件路径
+        img: BGR格式的图像数组
+    """
+    ext = os.path.splitext(filePath)[1].lower() or ".jpg"
+    params = [cv2.IMWRITE_JPEG_QUALITY, _JPEG_QUALITY] if ext in (".jpg", ".jpeg") else []
+    # 先写入同目录下以"."开头的临时文件再替换原文件，后台裁剪期间读取该图像的请求不会读到写了一半的文件
+    directory, name = os.path.split(filePath)
+    tempPath = os.path.join(directory, f".{name}.tmp")
+    cv2.imencode(ext, img, params)[1].tofile(tempPath)
+    os.replace(tempPath, filePath)
+
+
+def _readJpegOrientation(segment: bytes) -> int:
+    """
+    从JPEG的APP1段中读取EXIF方向标记
+
+    Args:
+        segment: APP1段的内容（不含标记和长度字段）
+
+    Returns:
+        int: EXIF方向值（1~8），未找到时返回1
+    """
+    if segment[:6] != b"Exif\x00\x00":
+        return 1
+    tiff = segment[6:]
+    endian = "<" if tiff[:2] == b"II" else ">"
+    ifdOffset = struct.unpack(endian + "I", tiff[4:8])[0]
+    count = struct.unpack(endian + "H", tiff[ifdOffset:ifdOffset + 2])[0]
+    for i in range(count):
+        entry = ifdOffset + 2 + i * 12
+        tag, _, _, value = struct.unpack(endian + "HHIH", tiff[entry:entry + 10])
+        if tag == 0x0112:  # Orientation
+            return value
+    return 1
+
+
+def _readHeaderSize(filePath: str) -> Optional[Tuple[int, int]]:
+    """
+    只解析文件头获取图像尺寸，不解码像素数据
+
+    支持PNG和JPEG，JPEG会按EXIF方向标记交换宽高，与解码后的图像保持一致。
+
+    Args:
+        filePath: 图像文件的路径
+
+    Returns:
+        Optional[Tuple[int, int]]: (高度, 宽度)，格式不支持或文件头无法解析时返回None
+    """
+    with open(filePath, "rb") as f:
+        head = f.read(24)
+        if head[:8] == b"\x89PNG\r\n\x1a\n" and head[12:16] == b"IHDR":
+            width, height = struct.unpack(">II", head[16:24])
+            return height, width
+        if head[:2] != b"\xff\xd8":
+            return None
+        f.seek(2)
+        orientation = 1
+        try:
+            while True:
+                marker = f.read(2)
+                if len(marker) < 2 or marker[0] != 0xFF:
+                    return None
+                while len(marker) == 2 and marker[1] == 0xFF:  # 跳过填充字节
+                    marker = marker[1:] + f.read(1)
+                if len(marker) < 2:
+                    return None
+                code = marker[1]
+                if code == 0x01 or 0xD0 <= code <= 0xD9:  # 无长度字段的独立标记
+                    continue
+                length = struct.unpack(">H", f.read(2))[0]
+                if 0xC0 <= code <= 0xCF and code not in (0xC4, 0xC8, 0xCC):  # SOF段，记录了图像尺寸
+                    height, width = struct.unpack(">xHH", f.read(5))
+                    return (width, height) if orientation >= 5 else (height, width)
+                if code == 0xE1:  # APP1段，可能包含EXIF方向
+                    orientation = _readJpegOrientation(f.read(length - 2))
+                else:
+                    f.seek(length - 2, os.SEEK_CUR)
+        except struct.error:  # 文件头被截断或格式异常
+            return None
+
 
 def getImageSize(filePath: str) -> Tuple[int, int]:
     """
@@ -31,10 +144,16 @@ def getImageSize(filePath: str) -> Tuple[int, int]:
 
     Raises:
         FileNotFoundError: 当指定的文件不存在时抛出
+
+    Note:
+        PNG和JPEG只读取文件头，其他格式或文件头无法解析时才完整解码图像
     """
     if not os.path.exists(filePath):
         raise FileNotFoundError(f"File not found: {filePath}")
-    img = cv2.imread(filePath)
+    size = _readHeaderSize(filePath)
+    if size is not None:
+        return size
+    img = _read(filePath)
     return img.shape[0], img.shape[1]
 
 
@@ -69,8 +188,7 @@ def cropImage(filePath: str, width: int, height: int, hAlign: str = "center", vA
     """
     if not os.path.exists(filePath):
         raise FileNotFoundError(f"File not found: {filePath}")
-    img = cv2.imread(filePath)
-    originHeight, originWidth = img.shape[0], img.shape[1]
+    originHeight, originWidth = getImageSize(filePath)  # 只读文件头，无需裁剪时不解码图像
     if width > originWidth or height > originHeight:
         return False
     if hAlign == "left":
@@ -89,8 +207,11 @@ def cropImage(filePath: str, width: int, height: int, hAlign: str = "center", vA
         height_range = (originHeight - height, originHeight)
     else:
         raise ValueError("vAlign must be one of 'top', 'center', 'bottom'")
+    if width == originWidth and height == originHeight:  # 尺寸已符合，不重新编码以免画质损失
+        return True
+    img = _read(filePath)
     img = img[height_range[0]:height_range[1], widthRange[0]:widthRange[1]]
-    cv2.imwrite(filePath, img)
+    _write(filePath, img)
     return True
 
 
@@ -120,17 +241,19 @@ def cropImageByScale(filePath: str, width: int, height: int) -> bool:
     """
     if not os.path.exists(filePath):
         raise FileNotFoundError(f"File not found: {filePath}")
-    img = cv2.imread(filePath)
-    originHeight, originWidth = img.shape[0], img.shape[1]
+    originHeight, originWidth = getImageSize(filePath)  # 只读文件头，无需裁剪时不解码图像
     if originWidth / originHeight > width / height:
         newWidth = originHeight * width // height
         newHeight = originHeight
     else:
         newWidth = originWidth
         newHeight = originWidth * height // width
+    if newWidth == originWidth and newHeight == originHeight:  # 比例已符合，不重新编码以免画质损失
+        return True
+    img = _read(filePath)
     img = img[(originHeight - newHeight) // 2:(originHeight + newHeight) // 2,
           (originWidth - newWidth) // 2:(originWidth + newWidth) // 2]
-    cv2.imwrite(filePath, img)
+    _write(filePath, img)
     return True
 
 
@@ -158,14 +281,43 @@ def cropImageSquare(filePath: str) -> bool:
     """
     if not os.path.exists(filePath):
         raise FileNotFoundError(f"File not found: {filePath}")
-    img = cv2.imread(filePath)
-    originHeight, originWidth = img.shape[0], img.shape[1]
+    originHeight, originWidth = getImageSize(filePath)  # 只读文件头，无需裁剪时不解码图像
     if originWidth == originHeight:
         return True
     edgeLength = min(originWidth, originHeight)
+    img = _read(filePath)
     if originWidth > originHeight:
         newImg = img[:, (originWidth - edgeLength) // 2:(originWidth + edgeLength) // 2]
     else:
         newImg = img[(originHeight - edgeLength) // 2:(originHeight + edgeLength) // 2, :]
-    cv2.imwrite(filePath, newImg)
+    _write(filePath, newImg)
     return True
+
+
+def cropImageAsync(filePath: str, cropFunc=cropImageSquare, *args) -> Future:
+    """
+    在后台线程中裁剪图像，立即返回
+
+    Args:
+        filePath: 要裁剪的图像文件路径
+        cropFunc: 使用的裁剪函数，默认为cropImageSquare
+        *args: 传给cropFunc的其余参数，如cropImageByScale的宽高比例
+
+    Returns:
+        Future: 裁剪任务，结果为cropFunc的返回值
+
+    Note:
+        裁剪完成前访问该图像得到的是上传的原图，裁剪完成后原子地替换为裁剪结果。
+        调用方通常不等待返回的Future，裁剪抛出的异常会记录到应用日志（不在应用上下文中调用时记录到本模块日志）
+    """
+    # 回调在裁剪线程中执行，没有应用上下文，提交时先取出应用的日志记录器
+    logger = current_app.logger if has_app_context() else logging.getLogger(__name__)
+
+    def logException(future: Future):
+        exception = None if future.cancelled() else future.exception()
+        if exception is not None:
+            logger.error("Failed to crop image %s", filePath, exc_info=exception)
+
+    future = _cropExecutor.submit(cropFunc, filePath, *args)
+    future.add_done_callback(logException)
+    return future
@@ -1,11 +1,17 @@
-import re
+import atexit
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor
 from email.mime.text import MIMEText
+from queue import Empty, SimpleQueue
 from smtplib import SMTP_SSL, SMTPException
 from typing import Union
 
 from bs4 import BeautifulSoup
-from requests import get as rget
+from requests import Session
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
+from Service.cache import TTLCache
 from Service.utils import getConfig
 
 __doc__ = """
@@ -16,6 +22,7 @@ __doc__ = """
    - 发送验证码邮件
    - 支持HTML格式邮件内容
    - 使用SSL加密的SMTP服务
+   - 后台线程发送，复用已登录的SMTP连接
 
 2. API服务（API类）
    - 调用第三方API（如豆瓣图书API）
@@ -25,6 +32,14 @@ __doc__ = """
 所有网络请求都包含适当的错误处理和异常捕获。
 """
 
+_REQUEST_TIMEOUT = 5  # 单次请求超时时间，单位秒
+_DOUBAN_CACHE_TTL = 24 * 60 * 60  # 豆瓣图书信息缓存一天，评分变化不频繁
+_POOL_MAXSIZE = 16  # 每个主机的最大连接数
+_MAIL_WORKERS = 2  # 后台发信线程数，也是最多同时保持的SMTP连接数
+_SMTP_OK = 250  # SMTP命令执行成功的响应码
+
+_logger = logging.getLogger(__name__)
+
 
 class Mail:
     """
@@ -33,6 +48,7 @@ class Mail:
     该类提供了邮件发送功能，主要用于发送验证码等系统邮件。
     使用smtplib和email库实现，支持SSL加密的SMTP服务。
     相比Flask自带的邮件功能，提供了更灵活的配置和更好的控制。
+    邮件在后台线程中发送，已登录的SMTP连接会被复用。
 
     Attributes:
         _host: SMTP服务器地址
@@ -40,6 +56,8 @@ class Mail:
         _username: 邮箱账号
         _password: 邮箱密码
         _sender: 发件人地址
+        _executor: 后台发信线程池
+        _connections: 空闲的已登录SMTP连接
         captchaPattern: 验证码邮件HTML模板
     """
 
@@ -58,6 +76,9 @@ class Mail:
         self._username = info['Username']  # 邮箱账号
         self._password = info['Password']  # 邮箱密码
         self._sender = info['Sender']  # 发件人
+        self._executor = ThreadPoolExecutor(max_workers=_MAIL_WORKERS, thread_name_prefix='mail')
+        self._connections = SimpleQueue()
+        atexit.register(self._close)  # 进程退出时登出并关闭空闲连接
         self.captchaPattern = """
         <h1>尊敬的用户：</h1>
         <p>您正在请求重设密码，为保证您的账号安全，需要根据邮箱验证码确定是您本人操作。</p>
@@ -69,7 +90,7 @@ class Mail:
         <p align="right">此致</p>
         <p align="right">墨韵平台 Steven</p>"""
 
-    def sendCaptcha(self, receiver: str, captcha: Union[str, int]) -> bool:
+    def sendCaptcha(self, receiver: str, captcha: Union[str, int]) -> Future:
         """
         发送验证码邮件
 
@@ -80,13 +101,14 @@ class Mail:
             captcha: 验证码，可以是字符串或整数
 
         Returns:
-            bool: 发送结果
+            Future: 发送任务，其结果为bool
                 - True: 发送成功
                 - False: 发送失败
 
         Note:
             - 验证码会被转换为字符串格式
             - 邮件使用HTML格式，包含完整的样式和布局
+            - 邮件交由后台线程发送，本方法立即返回，不阻塞请求
         """
         if isinstance(captcha, int):
             captcha = str(captcha)
@@ -95,7 +117,45 @@ class Mail:
         message['Subject'] = "墨韵 - 验证码"
         message['From'] = self._sender
         message['To'] = receiver
-        return self._send(receiver, message)
+        return self._executor.submit(self._send, receiver, message)
+
+    def _connect(self) -> SMTP_SSL:
+        """
+        取得一个已登录的SMTP连接，优先复用空闲连接
+
+        复用前先发送NOOP确认连接仍然可用，已被服务器断开的空闲连接会被关闭丢弃。
+
+        Returns:
+            SMTP_SSL: 已登录的SMTP连接
+        """
+        while True:
+            try:
+                smtpObj = self._connections.get_nowait()
+            except Empty:
+                break
+            try:
+                if smtpObj.noop()[0] == _SMTP_OK:
+                    return smtpObj
+            except (SMTPException, OSError):
+                pass
+            smtpObj.close()
+        smtpObj = SMTP_SSL(self._host, self._port)
+        smtpObj.login(self._username, self._password)
+        return smtpObj
+
+    def _close(self):
+        """
+        登出并关闭所有空闲的SMTP连接，在进程退出时调用
+        """
+        while True:
+            try:
+                smtpObj = self._connections.get_nowait()
+            except Empty:
+                return
+            try:
+                smtpObj.quit()
+            except (SMTPException, OSError):
+                smtpObj.close()
 
     def _send(self, receivers: Union[str, list], message: MIMEText) -> bool:
         """
@@ -114,22 +174,23 @@ class Mail:
 
         Note:
             - 使用SSL加密的SMTP连接
-            - 包含调试信息输出
-            - 自动处理连接关闭
-        """
-        try:
-            smtpObj = SMTP_SSL(self._host, self._port)
-            smtpObj.set_debuglevel(1)
-            # 登录到服务器
-            smtpObj.login(self._username, self._password)
-            # 发送
-            smtpObj.sendmail(self._sender, [receivers], message.as_string())
-            # 退出
-            smtpObj.quit()
-            return True
-        except SMTPException as e:
-            print(e)
-            return False
+            - 发送完成后连接放回空闲队列供下次复用
+            - 复用的连接可能已被服务器断开，此时重新连接并重试一次
+            - 重试后仍失败时记录异常日志
+        """
+        for attempt in range(2):
+            smtpObj = None
+            try:
+                smtpObj = self._connect()
+                smtpObj.sendmail(self._sender, [receivers], message.as_string())
+                self._connections.put(smtpObj)
+                return True
+            except (SMTPException, OSError):
+                if smtpObj is not None:
+                    smtpObj.close()
+                if attempt:
+                    _logger.exception("Failed to send mail to %s", receivers)
+        return False
 
 
 class API:
@@ -141,6 +202,8 @@ class API:
 
     Attributes:
         UA: 用户代理字符串，用于模拟浏览器请求
+        _session: 复用的HTTP会话，保持连接池与默认请求头
+        _doubanCache: 豆瓣图书信息缓存，键为豆瓣ID
     """
 
     def __init__(self):
@@ -148,11 +211,19 @@ class API:
         初始化API服务
 
         设置默认的用户代理字符串，用于模拟浏览器请求。
+        创建带连接池和失败重试的HTTP会话，多次请求复用同一TCP/TLS连接。
         """
         self.UA = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/113.0.0.0 ' \
                   'Safari/537.36 Edg/113.0.1774.57'
-
-    def getBookInfo_Douban(self, doubanID) -> dict:
+        retry = Retry(total=3, backoff_factor=0.5, status_forcelist=(500, 502, 503, 504), allowed_methods=('GET',))
+        adapter = HTTPAdapter(pool_connections=8, pool_maxsize=_POOL_MAXSIZE, max_retries=retry)
+        self._session = Session()
+        self._session.mount('https://', adapter)
+        self._session.mount('http://', adapter)
+        self._session.headers.update({'User-Agent': self.UA, 'Accept-Encoding': 'gzip'})
+        self._doubanCache = TTLCache(maxSize=1024, ttl=_DOUBAN_CACHE_TTL)
+
+    def getBookInfo_Douban(self, doubanID, refresh: bool = False) -> dict:
         """
         从豆瓣获取图书信息
 
@@ -164,6 +235,7 @@ class API:
 
         Args:
             doubanID: 豆瓣图书ID，可以是字符串或数字
+            refresh: 为True时跳过缓存直接请求豆瓣，并用结果更新缓存；写入数据库前需要最新评分时使用
 
         Returns:
             dict: 包含图书信息的字典，字段包括：
@@ -182,38 +254,49 @@ class API:
             - 使用BeautifulSoup解析HTML内容
             - 自动处理ID的类型转换
             - 包含完整的错误处理
+            - 结果按豆瓣ID缓存一天，重复获取同一本书不再请求豆瓣
         """
         if not isinstance(doubanID, str):
             doubanID = str(doubanID)
-        r = rget(f"https://book.douban.com/subject/{doubanID}", headers={"User-Agent": self.UA})
+        info = None if refresh else self._doubanCache.get(doubanID)
+        if info is None:
+            info = self._fetchBookInfo_Douban(doubanID)
+            self._doubanCache.set(doubanID, info)
+        return info.copy()
+
+    def _fetchBookInfo_Douban(self, doubanID: str) -> dict:
+        """
+        请求并解析豆瓣图书页面，不经过缓存
+
+        Args:
+            doubanID: 豆瓣图书ID
+
+        Returns:
+            dict: 图书信息，字段同getBookInfo_Douban
+        """
+        r = self._session.get(f"https://book.douban.com/subject/{doubanID}", timeout=_REQUEST_TIMEOUT)
         HTML = r.text
         r.close()
-        soup = BeautifulSoup(HTML, 'html.parser')
+        soup = BeautifulSoup(HTML, 'lxml')  # lxml为C实现的解析器，比纯Python的html.parser快得多
 
         title = soup.find('span', attrs={'property': 'v:itemreviewed'}).text  # 标题
         score = soup.find('strong', attrs={'class': 'll rating_num'}).text.strip()  # 豆瓣评分
         # 图书元信息
         metaInfo = {}
         htmlInfo = soup.find('div', id='info').text.split('\n')
-        htmlInfo = [i.strip() for i in htmlInfo if not re.fullmatch(' *', i)]
-
-        i, j = 0, 0
-        while i < len(htmlInfo):
-            if re.fullmatch('.+:', htmlInfo[i]):  # 一个单独的key
-                k = htmlInfo[i][:-1]
-                v = ""
-                j = i + 1  # value从下一个段开始
-                while j < len(htmlInfo) and not re.fullmatch('.+:.*', htmlInfo[j]):  # 找到下一个key
-                    v += htmlInfo[j]
-                    j += 1
-                metaInfo[k] = v
-                i = j
-            elif re.fullmatch('.+:.+', htmlInfo[i]):  # key:value形式的内容
-                k, v = htmlInfo[i].split(':')
-                metaInfo[k] = v.strip()
-                i += 1
-            else:
-                i += 1
+        htmlInfo = [i.strip() for i in htmlInfo if i.strip(' ')]  # 去掉只含空格的行
+
+        values = None  # 当前单独成行的key所收集的value片段
+        for line in htmlInfo:
+            if len(line) > 1 and line.endswith(':'):  # 一个单独的key，value在后续行中
+                values = metaInfo[line[:-1]] = []
+            elif line.find(':', 1) > 0:  # key:value形式的内容，只在第一个冒号处分割（value中可能还有冒号）
+                colon = line.find(':', 1)
+                metaInfo[line[:colon]] = line[colon + 1:].strip()
+                values = None
+            elif values is not None:
+                values.append(line)
+        metaInfo = {k: ''.join(v) if isinstance(v, list) else v for k, v in metaInfo.items()}
 
         # 图书简介
         intro = soup.find('span', attrs={'class': 'all hidden'})
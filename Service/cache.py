@@ -0,0 +1,90 @@
+from collections import OrderedDict
+from threading import Lock
+from time import monotonic
+
+__doc__ = """
+缓存模块
+
+该模块提供进程内的键值缓存，用于减少热点数据（如用户信息）的重复数据库查询：
+1. 容量限制
+   - 超出容量时淘汰最久未使用的条目（LRU）
+
+2. 过期时间
+   - 每个条目写入后在ttl秒内有效，过期后视为未命中
+
+3. 主动失效
+   - 数据被修改后由调用方按键删除对应条目
+"""
+
+
+class TTLCache:
+    """
+    带过期时间的LRU缓存
+
+    Attributes:
+        _maxSize: 最大条目数
+        _ttl: 条目有效期，单位秒
+        _data: 有序字典，键为缓存键，值为(过期时刻, 缓存值)
+    """
+
+    def __init__(self, maxSize: int = 4096, ttl: float = 60):
+        """
+        Args:
+            maxSize: 最大条目数，默认4096
+            ttl: 条目有效期，单位秒，默认60秒
+        """
+        self._maxSize = maxSize
+        self._ttl = ttl
+        self._data = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key, default=None):
+        """
+        读取缓存
+
+        Args:
+            key: 缓存键
+            default: 未命中（或已过期）时的返回值
+
+        Returns:
+            缓存值，未命中时返回default
+        """
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+            if item[0] < monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return item[1]
+
+    def set(self, key, value):
+        """
+        写入缓存，超出容量时淘汰最久未使用的条目
+
+        Args:
+            key: 缓存键
+            value: 缓存值
+        """
+        with self._lock:
+            self._data[key] = (monotonic() + self._ttl, value)
+            self._data.move_to_end(key)
+            if len(self._data) > self._maxSize:
+                self._data.popitem(last=False)
+
+    def invalidate(self, *keys):
+        """
+        删除指定的缓存条目
+
+        Args:
+            *keys: 要删除的缓存键，不存在的键会被忽略
+        """
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+
+    def clear(self):
+        """清空缓存"""
+        with self._lock:
+            self._data.clear()
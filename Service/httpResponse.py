@@ -1,6 +1,7 @@
 from flask import Flask, abort, render_template
 
 from Service.File.File import FileMgr
+from Service.cache import TTLCache
 
 __doc__ = """
 自定义HTTP响应模块
@@ -10,11 +11,12 @@ __doc__ = """
 2. 处理不同类型的HTTP错误（404、418、500、503等）
 3. 提供错误示例路由用于测试
 
-每个错误处理函数都会：
+每个错误处理函数都会（首次渲染时）：
 - 从数据库获取错误信息
 - 获取错误作者信息
 - 获取相关图片资源
 - 渲染自定义错误页面
+渲染结果按错误码缓存，之后的同类错误直接返回缓存的页面；修改error表后调用invalidateErrorPage使缓存失效。
 
 错误页面包含：
 - 错误代码
@@ -23,6 +25,26 @@ __doc__ = """
 - 相关图片
 """
 
+_ERROR_PAGE_TTL = 300  # 错误页面缓存有效期，单位秒
+_errorPageCache = TTLCache(maxSize=16, ttl=_ERROR_PAGE_TTL)  # 错误码 -> 渲染后的错误页面
+
+
+def invalidateErrorPage(errorCode: int = None):
+    """
+    使错误页面的缓存失效，下次出现该错误时重新查询并渲染
+
+    Args:
+        errorCode: 要失效的错误码，为None时清空所有错误页面
+
+    Note:
+        错误页面是错误信息唯一的缓存层，修改error表后调用本函数即可立即生效；
+        不调用时最长_ERROR_PAGE_TTL秒后生效
+    """
+    if errorCode is None:
+        _errorPageCache.clear()
+    else:
+        _errorPageCache.invalidate(errorCode)
+
 
 def customizeHttpResponse(app: Flask, fileMgr: FileMgr, db):
     """
@@ -41,6 +63,32 @@ def customizeHttpResponse(app: Flask, fileMgr: FileMgr, db):
         但会根据不同的错误类型显示不同的错误信息和状态码。
     """
 
+    def renderErrorPage(errorCode: int) -> str:
+        """
+        渲染错误页面，结果按错误码缓存
+
+        Args:
+            errorCode: HTTP错误码
+
+        Returns:
+            str: 渲染后的错误页面
+
+        Note:
+            错误页面的内容只取决于错误码（与登录用户无关），因此直接缓存渲染结果，
+            错误请求集中出现时不再重复查询数据库和扫描图片目录。
+            修改error表后应调用invalidateErrorPage，否则最长_ERROR_PAGE_TTL秒后生效
+        """
+        page = _errorPageCache.get(errorCode)
+        if page is None:
+            content = db.getError(errorCode)
+            author = db.getUser(content['authorID'])
+            profilePhoto = fileMgr.getProfilePhotoPath(author['id'])
+            errorImage = fileMgr.getErrorImagePath(errorCode)
+            page = render_template('error.html', content=content, author=author, profilePhoto=profilePhoto,
+                                   errorCode=errorCode, errorImage=errorImage)
+            _errorPageCache.set(errorCode, page)
+        return page
+
     @app.route("/errorSample/<int:errorCode>", methods=["GET"])
     def errorSample(errorCode):
         """
@@ -74,12 +122,7 @@ def customizeHttpResponse(app: Flask, fileMgr: FileMgr, db):
         Returns:
             tuple: (渲染后的错误页面, 404状态码)
         """
-        content = db.getError(error.code)
-        author = db.getUser(content['authorID'])
-        profilePhoto = fileMgr.getProfilePhotoPath(author['id'])
-        errorImage = fileMgr.getErrorImagePath(error.code)
-        return render_template('error.html', content=content, author=author, profilePhoto=profilePhoto,
-                               errorCode=error.code, errorImage=errorImage), 404
+        return renderErrorPage(error.code), 404
 
     @app.errorhandler(418)
     def im_a_teapot(error):
@@ -95,12 +138,7 @@ def customizeHttpResponse(app: Flask, fileMgr: FileMgr, db):
         Returns:
             tuple: (渲染后的错误页面, 418状态码)
         """
-        content = db.getError(error.code)
-        author = db.getUser(content['authorID'])
-        profilePhoto = fileMgr.getProfilePhotoPath(author['id'])
-        errorImage = fileMgr.getErrorImagePath(error.code)
-        return render_template('error.html', content=content, author=author, profilePhoto=profilePhoto,
-                               errorCode=error.code, errorImage=errorImage), 418
+        return renderErrorPage(error.code), 418
 
     @app.errorhandler(500)
     def internal_server_error(error):
@@ -116,12 +154,7 @@ def customizeHttpResponse(app: Flask, fileMgr: FileMgr, db):
         Returns:
             tuple: (渲染后的错误页面, 500状态码)
         """
-        content = db.getError(error.code)
-        author = db.getUser(content['authorID'])
-        profilePhoto = fileMgr.getProfilePhotoPath(author['id'])
-        errorImage = fileMgr.getErrorImagePath(error.code)
-        return render_template('error.html', content=content, author=author, profilePhoto=profilePhoto,
-                               errorCode=error.code, errorImage=errorImage), 500
+        return renderErrorPage(error.code), 500
 
     @app.errorhandler(503)
     def service_unavailable(error):
@@ -137,9 +170,4 @@ def customizeHttpResponse(app: Flask, fileMgr: FileMgr, db):
         Returns:
             tuple: (渲染后的错误页面, 503状态码)
         """
-        content = db.getError(error.code)
-        author = db.getUser(content['authorID'])
-        profilePhoto = fileMgr.getProfilePhotoPath(author['id'])
-        errorImage = fileMgr.getErrorImagePath(error.code)
-        return render_template('error.html', content=content, author=author, profilePhoto=profilePhoto,
-                               errorCode=error.code, errorImage=errorImage), 503
+        return renderErrorPage(error.code), 503
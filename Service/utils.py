@@ -1,7 +1,9 @@
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import os
-import yaml
-from typing import Union
+from types import MappingProxyType
+from typing import Mapping, Union
+
+from Service.cache import TTLCache
 
 __doc__ = """
 工具函数模块
@@ -11,6 +13,7 @@ __doc__ = """
    - 读取配置文件（支持自定义配置和默认配置）
    - 支持分类和键值对配置项
    - 支持多种配置数据类型
+   - 解析结果按文件缓存，文件修改后自动重新加载
 
 2. 时间处理
    - 处理服务器和客户端时区差异
@@ -18,7 +21,80 @@ __doc__ = """
    - 支持不同地区的时区设置
 """
 
-def getConfig(category: str = None, key: str = None) -> Union[dict, str, int]:
+# 使用的配置文件，导入时确定一次：存在myConfig.yaml时优先使用，否则使用config.yaml
+_CONFIG_PATH = "myConfig.yaml" if os.path.exists("myConfig.yaml") else "config.yaml"
+_CONFIG_CACHE_SIZE = 100  # 最多缓存的配置文件数
+# 配置文件解析结果缓存，键为文件路径，值为(修改时间, 文件大小, 配置字典)；有效性由文件状态判断，不按时间过期
+_configCache = TTLCache(maxSize=_CONFIG_CACHE_SIZE, ttl=float("inf"))
+_flatConfig = (None, {})  # (配置字典, 展平后的查找表)，配置重新加载后按需重建
+_MISSING = object()  # 查找表中不存在的标记，配置值本身可能为None或False
+
+
+def _loadYamlCached(path: str) -> dict:
+    """
+    读取并解析YAML文件，按文件缓存解析结果
+
+    Args:
+        path: YAML文件路径
+
+    Returns:
+        dict: 解析后的内容，为缓存中的共享对象
+
+    Note:
+        每次调用只做一次os.stat，文件的修改时间和大小都未变化时直接返回缓存；
+        缓存按最近最少使用淘汰，最多保留_CONFIG_CACHE_SIZE个文件
+    """
+    stat = os.stat(path)
+    cached = _configCache.get(path)
+    if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        return cached[2]
+    import yaml  # 延迟到首次解析时导入，只使用Time等工具时不加载PyYAML
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)  # libyaml的C实现，比纯Python加载器快一个数量级
+    with open(path, "rb") as f:  # 直接交给YAML解析器按UTF-8解码，省去一次Python层的整体解码
+        content = yaml.load(f, Loader=loader)
+    _configCache.set(path, (stat.st_mtime_ns, stat.st_size, content))
+    return content
+
+
+def _freeze(value):
+    """
+    把配置值递归转换为只读对象，字典转为MappingProxyType，列表转为元组
+
+    Args:
+        value: 解析得到的配置值
+
+    Returns:
+        只读的配置值，标量原样返回
+    """
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(sub) for key, sub in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _flatten(config: dict) -> dict:
+    """
+    把配置展平为以(类别, 键名)为键的查找表
+
+    Args:
+        config: 完整的配置字典
+
+    Returns:
+        dict: 查找表，(类别, 键名)对应具体配置值，(类别, None)对应整个类别的配置，(None, None)对应整个配置；
+            其中的字典和列表均已转换为只读对象
+    """
+    config = _freeze(config)
+    flat = {(None, None): config}
+    for category, sub in config.items():
+        flat[(category, None)] = sub
+        if isinstance(sub, Mapping):
+            for key, value in sub.items():
+                flat[(category, key)] = value
+    return flat
+
+
+def getConfig(category: str = None, key: str = None) -> Union[Mapping, str, int]:
     """
     获取配置文件中的配置项
 
@@ -30,29 +106,29 @@ def getConfig(category: str = None, key: str = None) -> Union[dict, str, int]:
         key: 配置项键名，如果为None则返回整个类别的配置
 
     Returns:
-        Union[dict, str, int]: 配置值
-            - 如果category和key都为None，返回整个配置字典
-            - 如果只有key为None，返回指定类别的配置字典
+        Union[Mapping, str, int]: 配置值
+            - 如果category和key都为None，返回整个配置（只读映射）
+            - 如果只有key为None，返回指定类别的配置（只读映射）
             - 否则返回指定类别和键名的具体配置值
 
     Note:
         - 配置文件使用YAML格式
-        - 支持UTF-8编码
-        - 使用yaml.FullLoader加载器以支持所有YAML特性
+        - 支持UTF-8编码（含BOM），以二进制方式读取，由解析器解码
+        - 使用安全加载器，优先采用libyaml的C实现(CSafeLoader)，未安装libyaml时退回纯Python实现
+        - 使用哪个配置文件在模块导入时确定，之后新建myConfig.yaml需要重启才会生效
+        - 解析结果会被缓存，仅当文件的修改时间或大小变化时才重新读取
+        - 返回的配置为缓存中共享的只读映射(MappingProxyType)，修改会抛出TypeError；需要修改时请先用dict()复制
+        - 配置加载后会展平为(类别, 键名)查找表，每次读取只需一次字典查找
     """
-    if os.path.exists(os.path.join(os.getcwd(), "myConfig.yaml")):
-        with open("myConfig.yaml", "r", encoding="utf-8") as f:
-            config = yaml.load(f, Loader=yaml.FullLoader)
-    else:
-        with open("config.yaml", "r", encoding="utf-8") as f:
-            config = yaml.load(f, Loader=yaml.FullLoader)
-    if category is None or category not in config:
-        return config
-    else:
-        if key is None or key not in config[category]:
-            return config[category]
-        else:
-            return config[category][key]
+    global _flatConfig
+    config = _loadYamlCached(_CONFIG_PATH)
+    if _flatConfig[0] is not config:
+        _flatConfig = (config, _flatten(config))
+    flat = _flatConfig[1]
+    result = flat.get((category, key), _MISSING)
+    if result is _MISSING:  # 键名为None或不存在时返回整个类别，类别为None或不存在时返回整个配置
+        result = flat.get((category, None), flat[(None, None)])
+    return result
 
 
 class Time:
@@ -66,10 +142,12 @@ class Time:
         _host_time_zone: 服务器时区（UTC+0）
         _client_time_zone: 客户端时区配置
             - zh-CN: 中国时区（UTC+8）
+        _time_formats: 各时间格式对应的strftime格式串
     """
 
     _host_time_zone = 0  # UTC+0
-    _client_time_zone = {'zh-CN': 8}  # UTC+8，东8区
+    _client_time_zone = {'zh-CN': timezone(timedelta(hours=8))}  # UTC+8，东8区
+    _time_formats = {"datetime": "%Y-%m-%d %H:%M:%S", "date": "%Y-%m-%d", "time": "%H:%M:%S"}
 
     @classmethod
     def getClientNow(cls, region: str = "zh-CN", time_format: str = "datetime") -> str:
@@ -89,20 +167,16 @@ class Time:
             str: 格式化后的时间字符串
 
         Raises:
-            Exception: 当time_format参数无效时抛出异常
+            ValueError: 当time_format参数无效时抛出异常
 
         Note:
             - 时间基于服务器UTC时间进行转换
             - 自动处理时区差异
             - 默认使用中国时区（UTC+8）
         """
-        host_now = datetime.utcnow()  # 服务器时间
-        client_now = host_now + timedelta(hours=cls._client_time_zone[region])  # 客户端时间
-        if time_format == "datetime":
-            return client_now.now().strftime("%Y-%m-%d %H:%M:%S")
-        elif time_format == "date":
-            return client_now.now().strftime("%Y-%m-%d")
-        elif time_format == "time":
-            return client_now.now().strftime("%H:%M:%S")
-        else:
-            raise Exception("Invalid format")
+        try:
+            fmt = cls._time_formats[time_format]
+        except KeyError:
+            raise ValueError(f"Invalid format: {time_format}") from None
+        client_now = datetime.now(cls._client_time_zone[region])  # 客户端时间
+        return client_now.strftime(fmt)
@@ -1,7 +1,10 @@
+import gzip
 import os
 import random
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from flask import Flask, abort, render_template, url_for, request, redirect, session, flash, jsonify
+from flask import Flask, abort, render_template, url_for, request, redirect, session, flash, jsonify, make_response
 from Service import Img, utils
 from Service.DB.Operation import Database
 from Service.File.File import FileMgr
@@ -49,6 +52,12 @@ app = Flask(__name__,
             template_folder=(os.getcwd() + "/templates").replace("\\", "/"),
             static_folder=(os.getcwd() + "/static").replace("\\", "/"))  # app作为全局变量，并指定部分资源的路径
 app.config.update(utils.getConfig('Flask'))  # 从配置文件中读取Flask配置
+# Flask 2.3起JSON_AS_ASCII配置项不再生效，改为设置JSON provider；不转义中文、不排序键，返回的json更短、序列化更快
+app.json.ensure_ascii = app.config.get("JSON_AS_ASCII", True)
+app.json.sort_keys = False
+if app.config.get("SESSION_TYPE"):  # 配置了服务端session存储时，cookie中只保存session ID
+    from flask_session import Session
+    Session(app)
 
 # 配置服务
 api = API()  # 豆瓣API服务
@@ -57,6 +66,101 @@ db = Database(app)  # 数据库服务
 fileMgr = FileMgr(workPath=os.getcwd())  # 文件管理服务
 # 附加自定义的错误页面
 customizeHttpResponse(app, fileMgr, db)
+searchExecutor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="search")  # 综合搜索中并发执行子查询的线程池
+
+
+def runInAppContext(func, *args):
+    """
+    在新的应用上下文中执行函数，供线程池中的任务访问数据库
+
+    Args:
+        func: 要执行的函数
+        *args: 传给func的参数
+
+    Returns:
+        func的返回值
+
+    Note:
+        每个应用上下文有独立的数据库会话，上下文结束时会话随之关闭并归还连接
+    """
+    with app.app_context():
+        return func(*args)
+
+
+def conditionalResponse(html: str):
+    """
+    为只读页面生成带ETag的响应，浏览器再次请求且页面未变化时返回304
+
+    Args:
+        html: 渲染好的页面
+
+    Returns:
+        Response: 带ETag和Cache-Control的响应，请求的If-None-Match与ETag一致时为不含正文的304响应
+
+    Note:
+        页面含有登录用户信息和flash消息，因此只允许浏览器私有缓存，且每次使用前都需向服务器验证
+    """
+    response = make_response(html)
+    response.headers["Cache-Control"] = "private, no-cache"
+    response.add_etag()
+    return response.make_conditional(request)
+
+
+_COMPRESS_MIN_SIZE = 500  # 小于该字节数的响应不压缩，压缩收益抵不过开销
+_COMPRESS_LEVEL = 6  # gzip压缩级别
+_COMPRESS_MIMETYPES = {"text/html", "application/json"}  # 需要压缩的响应类型
+
+
+@app.after_request
+def compressResponse(response):
+    """
+    对页面和json响应进行gzip压缩
+
+    Args:
+        response: 视图函数返回的响应
+
+    Returns:
+        Response: 客户端支持gzip且响应足够大时返回压缩后的响应，否则原样返回
+
+    Note:
+        - 静态文件等直通响应不压缩
+        - 压缩后ETag改为弱ETag，304判断不受影响
+    """
+    response.vary.add("Accept-Encoding")
+    if ("gzip" not in request.headers.get("Accept-Encoding", "") or response.direct_passthrough
+            or response.mimetype not in _COMPRESS_MIMETYPES or "Content-Encoding" in response.headers
+            or response.status_code != 200):
+        return response
+    data = response.get_data()
+    if len(data) < _COMPRESS_MIN_SIZE:
+        return response
+    response.set_data(gzip.compress(data, compresslevel=_COMPRESS_LEVEL))
+    response.headers["Content-Encoding"] = "gzip"
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+
+def groupMessages(messages: list[dict], key: str) -> dict:
+    """
+    将消息按指定字段分组
+
+    Args:
+        messages: 消息字典列表
+        key: 分组依据的字段名，如journalID
+
+    Returns:
+        dict: 键为字段值（升序），值为该组的消息列表，组内保持原有顺序
+
+    Note:
+        只遍历一次消息列表
+    """
+    groups = defaultdict(list)
+    for message in messages:
+        groups[message[key]].append(message)
+    return dict(sorted(groups.items()))
+
 
 """1.账号管理"""
 
@@ -88,7 +192,7 @@ def index():
             session["loginUser"]["profilePhoto"] = fileMgr.getProfilePhotoPath(session["loginUser"]["id"],
                                                                                enableDefault=True)
             db.modifyUser(session["loginUser"]["id"],
-                          lastLoginTime=datetime.strftime(datetime.now(), "%Y-%m-%d %H:%M:%S"))  # 更新登录时间
+                          lastLoginTime=datetime.now().replace(microsecond=0))  # 更新登录时间
             flash("登录成功", "success")
             return redirect(url_for("home"))
         else:  # 如果验证失败，跳转回登录页面
@@ -235,9 +339,9 @@ def home():
     # 获取首页相关信息
     unreadMessageNum = db.getAllUnreadMessageNum(session.get("loginUser")['id'])
     journals = db.getAllJournalByAuthorID(session.get("loginUser")['id'], limit=5)
-    unreadMessageNum = db.getAllUnreadMessageNum(session.get("loginUser")['id'])
+    headerPaths = fileMgr.getJournalHeaderPaths(journal["id"] for journal in journals)  # 只列一次目录
     for journal in journals:
-        journal["headerPath"] = fileMgr.getJournalHeaderPath(journal["id"])
+        journal["headerPath"] = headerPaths[journal["id"]]
     return render_template("home.html", loginUser=session.get("loginUser"), journals=journals,
                            unreadMessageNum=unreadMessageNum)
 
@@ -264,9 +368,7 @@ def journalMenu():
         flash("请先登录", "info")
         return redirect(url_for("index"))
     # 获取书评列表
-    journals = db.getAllJournal()
-    for journal in journals:
-        journal["account"] = db.getUser(journal["authorID"])["account"]
+    journals = db.getAllJournalWithAuthor()  # 作者用户名随书评一起查询
     return render_template("journalMenu.html", loginUser=session.get("loginUser"), journals=journals)
 
 
@@ -292,15 +394,17 @@ def journal(journalID: int):
     if request.method == "GET":  # 查看书评
         journal = db.getJournal(journalID)
         journalHeader = fileMgr.getJournalHeaderPath(journal["id"])
-        author = db.getUser(journal["authorID"])
         book = db.getBook(journal["bookID"])
         bookCover = fileMgr.getBookCoverPath(book["id"])
         # 获取评论
         comments = db.getJournalComments(journalID)
+        # 页面只展示作者和评论者的ID与用户名，一次查询取回，无需读取完整的用户信息
+        accounts = db.getAccounts({journal["authorID"]} | {comment["authorID"] for comment in comments})
+        author = {"id": journal["authorID"], "account": accounts[journal["authorID"]]}
+        profilePhotos = fileMgr.getProfilePhotoPaths(accounts)  # 只列一次目录
         for comment in comments:
-            authorInfo = db.getUser(comment["authorID"])
-            comment["account"] = authorInfo["account"]
-            comment["profilePhoto"] = fileMgr.getProfilePhotoPath(comment["authorID"])
+            comment["account"] = accounts[comment["authorID"]]
+            comment["profilePhoto"] = profilePhotos[comment["authorID"]]
         # 标记为已读
         if session.get("loginUser") and journal['authorID'] == session.get("loginUser")['id']:
             db.markAllJournalCommentAsRead(journalID)
@@ -316,21 +420,19 @@ def journal(journalID: int):
         data = dict(request.form)
         if "commentUserID" in data:  # 评论
             comment = data["comment"]
-            authorID = int(data["commentUserID"])
-            publishTime = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            authorID = session.get("loginUser")["id"]  # 评论者即登录用户，不信任表单中的用户ID
+            publishTime = datetime.now().replace(microsecond=0)
             db.addJournalComment(journalID, comment, authorID, publishTime)
-            authorProfilePhoto = fileMgr.getProfilePhotoPath(authorID, enableDefault=True)
+            authorProfilePhoto = session.get("loginUser")["profilePhoto"]
             return jsonify({"account": session.get("loginUser")["account"],
                             "authorID": authorID, "authorProfilePhoto": authorProfilePhoto,
-                            "publishTime": publishTime,
+                            "publishTime": str(publishTime),
                             "comment": comment})
         elif "likeUserID" in data:  # 点赞
-            authorID = data["likeUserID"]
-            likeNum = db.getJournal(journalID)["likeNum"]
-            if db.addJournalLike(journalID, authorID):
-                return jsonify({"likeNum": likeNum + 1, "isLiked": False})
-            else:
-                return jsonify({"likeNum": likeNum, "isLiked": True})
+            authorID = session.get("loginUser")["id"]
+            isLiked = not db.addJournalLike(journalID, authorID)  # 重复点赞时插入失败
+            # 点赞后再计数，包含其他用户同时的点赞；只查点赞表，不再读取整篇日志
+            return jsonify({"likeNum": db.getJournalLikeNum(journalID), "isLiked": isLiked})
 
 
 @app.route("/writeJournal", methods=["GET", "POST"])
@@ -358,15 +460,15 @@ def createJournal():
     else:  # 发表书评
         journalHeader = request.files.get("journalHeader")  # 书评封面
         title = request.form.get("title")
-        content = request.form.get("content").split('\r\n')
-        publishTime = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        content = request.form.get("content").replace('\r\n', '\n')  # 数据库中以"\n"分段存储
+        publishTime = datetime.now().replace(microsecond=0)
         authorID = session.get("loginUser")["id"]
         bookID = int(request.form.get("bookID"))
         journalID = db.addJournal(title, content, publishTime, authorID, bookID)
         if journalHeader:  # 处理书评封面
             targetPath = fileMgr.generateJournalHeaderPath(journalID, abs=True)
             journalHeader.save(targetPath)
-            Img.cropImageByScale(targetPath, 5, 2)  # 裁剪为'5：2'图片
+            Img.cropImageAsync(targetPath, Img.cropImageByScale, 5, 2)  # 后台裁剪为'5：2'图片
         flash("发表成功", "success")
         return redirect(url_for("journal", journalID=journalID))  # 返回到新书评页
 
@@ -416,7 +518,10 @@ def profile(userID):
     if not user:  # 转到404
         abort(404)
     journals = db.getAllJournalByAuthorID(userID)
-    profilePhoto = fileMgr.getProfilePhotoPath(userID)
+    if userID == session.get("loginUser")["id"]:  # 登录用户的头像路径已记录在session中，无需再列目录
+        profilePhoto = session.get("loginUser")["profilePhoto"]
+    else:
+        profilePhoto = fileMgr.getProfilePhotoPath(userID)
     return render_template("profile.html", loginUser=session.get("loginUser"), user=user,
                            journals=journals, profilePhoto=profilePhoto)
 
@@ -454,13 +559,13 @@ def editProfile():
                 photoPath = fileMgr.generateProfilePhotoPath(userID, abs=True)
             fileMgr.deleteProfilePhoto(userID)  # 删除原有头像
             profilePhoto.save(photoPath)  # 保存新头像
-            Img.cropImageSquare(photoPath)  # 裁剪成正方形
+            Img.cropImageAsync(photoPath, Img.cropImageSquare)  # 后台裁剪成正方形
         flash("修改成功", "success")
         session["loginUser"] = db.getUser(userID)  # 更新session中的用户信息
         session["loginUser"]["profilePhoto"] = fileMgr.getProfilePhotoPath(userID, enableDefault=True)
         return redirect(f"/profile/{userID}")
     else:
-        profilePhoto = fileMgr.getProfilePhotoPath(session.get("loginUser")["id"])
+        profilePhoto = session.get("loginUser")["profilePhoto"]  # 登录和修改资料时已记录
         return render_template("editProfile.html", loginUser=session.get("loginUser"), profilePhoto=profilePhoto)
 
 
@@ -486,9 +591,10 @@ def bookMenu():
         flash("请先登录", "info")
         return redirect(url_for("index"))
     books = db.getAllBook()
+    bookCovers = fileMgr.getBookCoverPaths(book["id"] for book in books)
     for book in books:
-        book["bookCover"] = fileMgr.getBookCoverPath(book["id"], enableDefault=True)
-    return render_template("bookMenu.html", loginUser=session.get("loginUser"), books=books)
+        book["bookCover"] = bookCovers[book["id"]]
+    return conditionalResponse(render_template("bookMenu.html", loginUser=session.get("loginUser"), books=books))
 
 
 @app.route("/book/<int:bookID>", methods=["GET"])
@@ -515,7 +621,8 @@ def book(bookID: int):
         return redirect(url_for("index"))
     book = db.getBook(bookID)
     bookCover = fileMgr.getBookCoverPath(bookID, enableDefault=True)
-    return render_template("book.html", loginUser=session.get("loginUser"), book=book, bookCover=bookCover)
+    return conditionalResponse(render_template("book.html", loginUser=session.get("loginUser"), book=book,
+                                               bookCover=bookCover))
 
 
 @app.route("/editBook/<int:bookID>", methods=["GET", "POST"])
@@ -560,7 +667,7 @@ def editBook(bookID: int):
         type = request.form.get("type")
         isbn = request.form.get("isbn")
         description = request.form.get("description")
-        doubanScore = api.getBookInfo_Douban(doubanID)['doubanScore']
+        doubanScore = api.getBookInfo_Douban(doubanID, refresh=True)['doubanScore']  # 写入数据库，不使用缓存的旧评分
         if db.modifyBook(bookID,
                          isbn=isbn,
                          title=title,
@@ -615,12 +722,11 @@ def groupMenu():
     if not session.get("loginUser"):
         flash("请先登录", "info")
         return redirect(url_for("index"))
-    groups = db.getAllGroup()
+    groups = db.getAllGroupWithNum()  # 成员数量和帖子数量随圈子一起查询
+    groupIcons = fileMgr.getGroupIconPaths(group["id"] for group in groups)
     for group in groups:
-        group["groupIcon"] = fileMgr.getGroupIconPath(group["id"], enableDefault=True)
-        group["userNum"] = db.getGroupUserNum(group["id"])
-        group["discussionNum"] = db.getGroupDiscussionNum(group["id"])
-    return render_template("groupMenu.html", loginUser=session.get("loginUser"), groups=groups)
+        group["groupIcon"] = groupIcons[group["id"]]
+    return conditionalResponse(render_template("groupMenu.html", loginUser=session.get("loginUser"), groups=groups))
 
 
 @app.route("/group/<int:groupID>", methods=["GET"])
@@ -647,18 +753,21 @@ def group(groupID: int):
         flash("请先登录", "info")
         return redirect(url_for("index"))
     group = db.getGroup(groupID)
-    group['account'] = db.getUser(group['founderID'])['account']
     if session.get("loginUser")["id"] == group['founderID']:
         db.markAllDiscussionAsRead(groupID)
     discussionsInfo = db.getGroupAllDiscussion(groupID)
-    for discussion in discussionsInfo:
-        discussion["account"] = db.getUser(discussion["posterID"])["account"]
-        discussion["repliesNum"] = db.getGroupDiscussionRepliesNum(discussion["id"])
     group["groupIcon"] = fileMgr.getGroupIconPath(groupID, enableDefault=True)
     replies = db.getGroupReplies(groupID, limit=5)
+    # 圈主、发帖人和回复者的用户名一次查询取回
+    accounts = db.getAccounts({group['founderID']} | {discussion["posterID"] for discussion in discussionsInfo} |
+                              {reply["authorID"] for reply in replies})
+    group['account'] = accounts[group['founderID']]
+    for discussion in discussionsInfo:
+        discussion["account"] = accounts[discussion["posterID"]]
+    profilePhotos = fileMgr.getProfilePhotoPaths({reply["authorID"] for reply in replies})  # 只列一次目录
     for reply in replies:
-        reply["account"] = db.getUser(reply["authorID"])["account"]
-        reply["profilePhoto"] = fileMgr.getProfilePhotoPath(reply["authorID"], enableDefault=True)
+        reply["account"] = accounts[reply["authorID"]]
+        reply["profilePhoto"] = profilePhotos[reply["authorID"]]
     return render_template("group.html",
                            loginUser=session.get("loginUser"),
                            group=group,
@@ -689,7 +798,6 @@ def editGroup(groupID: int):
         flash("请先登录", "info")
         return redirect(url_for("index"))
     group = db.getGroup(groupID)  # group信息
-    group['account'] = db.getUser(group['founderID'])['account']
     group["groupIcon"] = fileMgr.getGroupIconPath(groupID, enableDefault=True)
 
     if session.get("loginUser").get("id") != group['founderID']:
@@ -697,13 +805,17 @@ def editGroup(groupID: int):
         return redirect(url_for("home"))
     if request.method == "GET":
         discussions = db.getGroupAllDiscussion(groupID)  # discussion信息
-        for discussion in discussions:
-            discussion["account"] = db.getUser(discussion["posterID"])["account"]
-            discussion["repliesNum"] = db.getGroupDiscussionRepliesNum(discussion["id"])
         groupUsers = db.getAllGroupUser(groupID)  # groupUser列表
+        # 圈主、发帖人和成员的用户名一次查询取回
+        accounts = db.getAccounts({group['founderID']} | {discussion["posterID"] for discussion in discussions} |
+                                  {user["userID"] for user in groupUsers})
+        group['account'] = accounts[group['founderID']]
+        for discussion in discussions:
+            discussion["account"] = accounts[discussion["posterID"]]
+        profilePhotos = fileMgr.getProfilePhotoPaths(user["userID"] for user in groupUsers)  # 只列一次目录
         for user in groupUsers:
-            user["account"] = db.getUser(user["userID"])["account"]
-            user['profilePhoto'] = fileMgr.getProfilePhotoPath(user['userID'], enableDefault=True)
+            user["account"] = accounts[user["userID"]]
+            user['profilePhoto'] = profilePhotos[user['userID']]
         return render_template("editGroup.html", loginUser=session.get("loginUser"), discussions=discussions,
                                group=group, groupUsers=groupUsers)
     else:
@@ -720,7 +832,7 @@ def editGroup(groupID: int):
                 targetPath = fileMgr.generateGroupIconPath(groupID, abs=True)
                 fileMgr.deleteGroupIcon(targetPath)
                 icon.save(targetPath)
-                Img.cropImageSquare(targetPath)
+                Img.cropImageAsync(targetPath, Img.cropImageSquare)  # 后台裁剪为正方形
             return redirect(url_for("group", groupID=groupID))
 
 
@@ -750,12 +862,11 @@ def createGroup():
         name = request.form.get("name")
         description = request.form.get("description")
         founderID = session.get("loginUser")["id"]
-        establishTime = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        groupID = db.addGroup(name, description, founderID, establishTime)
+        groupID = db.addGroup(name, description, founderID)  # 建立时间缺省为当前时间
         if groupIcon:
             targetPath = fileMgr.generateGroupIconPath(groupID, abs=True)
             groupIcon.save(targetPath)
-            Img.cropImageSquare(targetPath)  # 裁剪为正方形
+            Img.cropImageAsync(targetPath, Img.cropImageSquare)  # 后台裁剪为正方形
             flash("创建成功", "success")
         return redirect(url_for("group", groupID=groupID))
 
@@ -788,25 +899,27 @@ def discussion(discussionID: int):
         return redirect(url_for("index"))
     if request.method == "GET":  # 查看帖子
         discussion = db.getGroupDiscussion(discussionID)
-        author = db.getUser(discussion["posterID"])
         discussionReplies = db.getGroupDiscussionReplies(discussionID)
         if session.get("loginUser")["id"] == discussion["posterID"]:
             db.markAllDiscussionReplyAsRead(discussionID)
+        accounts = db.getAccounts({discussion["posterID"]} | {reply["authorID"] for reply in discussionReplies})
+        author = {"id": discussion["posterID"], "account": accounts[discussion["posterID"]]}
+        profilePhotos = fileMgr.getProfilePhotoPaths(accounts)  # 只列一次目录
         for reply in discussionReplies:
-            reply["account"] = db.getUser(reply["authorID"])["account"]
-            reply["profilePhoto"] = fileMgr.getProfilePhotoPath(reply["authorID"], enableDefault=True)
+            reply["account"] = accounts[reply["authorID"]]
+            reply["profilePhoto"] = profilePhotos[reply["authorID"]]
         return render_template("discussion.html", loginUser=session.get("loginUser"),
                                discussion=discussion, author=author, discussionReplies=discussionReplies)
     elif request.method == "POST":  # 发表回帖
         data = dict(request.form)
-        replyUserID = int(data['replyUserID'])
+        replyUserID = session.get("loginUser")["id"]  # 回复者即登录用户，不信任表单中的用户ID
         replyContent = data['replyContent']
-        replyTime = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        replyTime = datetime.now().replace(microsecond=0)
         db.addGroupDiscussionReply(discussionID, replyUserID, replyContent, replyTime)
-        authorProfilePhoto = fileMgr.getProfilePhotoPath(replyUserID, enableDefault=True)
+        authorProfilePhoto = session.get("loginUser")["profilePhoto"]
         return jsonify({'account': session.get("loginUser")['account'],
                         'authorID': replyUserID, 'authorProfilePhoto': authorProfilePhoto,
-                        'replyTime': replyTime, 'replyContent': replyContent})
+                        'replyTime': str(replyTime), 'replyContent': replyContent})
 
 
 @app.route("/writeDiscussion/<int:groupID>", methods=["GET", "POST"])
@@ -838,7 +951,7 @@ def writeDiscussion(groupID: int):
         title = request.form.get("title")
         content = request.form.get("content")
         posterID = session.get("loginUser")["id"]
-        postTime = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        postTime = datetime.now().replace(microsecond=0)
         id = db.addGroupDiscussion(posterID, groupID, postTime, title, content)
         flash("发表成功", "success")
         return redirect(url_for("discussion", discussionID=id))
@@ -847,6 +960,84 @@ def writeDiscussion(groupID: int):
 """8. 搜索相关"""
 
 
+def searchJournals(keyword: str) -> list[dict]:
+    """
+    搜索书评并补充书评头图路径
+
+    Args:
+        keyword: 搜索关键词
+
+    Returns:
+        list[dict]: 书评信息列表，每项附带header和searchType
+    """
+    results = db.searchJournal(keyword)
+    headers = fileMgr.getJournalHeaderPaths(journal["id"] for journal in results)
+    for journal in results:
+        journal["header"] = headers[journal["id"]]
+        journal["searchType"] = "journal"
+    return results
+
+
+def searchBooks(keyword: str) -> list[dict]:
+    """
+    搜索书籍并补充封面路径
+
+    Args:
+        keyword: 搜索关键词
+
+    Returns:
+        list[dict]: 书籍信息列表，每项附带bookCover和searchType
+    """
+    results = db.searchBook(keyword)
+    bookCovers = fileMgr.getBookCoverPaths(book["id"] for book in results)
+    for book in results:
+        book["bookCover"] = bookCovers[book["id"]]
+        book["searchType"] = "book"
+    return results
+
+
+def searchGroups(keyword: str) -> list[dict]:
+    """
+    搜索圈子并补充圈子头像路径和圈主用户名
+
+    Args:
+        keyword: 搜索关键词
+
+    Returns:
+        list[dict]: 圈子信息列表，每项附带groupIcon、founder和searchType
+    """
+    results = db.searchGroup(keyword)
+    accounts = db.getAccounts({group["founderID"] for group in results})
+    groupIcons = fileMgr.getGroupIconPaths(group["id"] for group in results)
+    for group in results:
+        group["groupIcon"] = groupIcons[group["id"]]
+        group["founder"] = accounts[group["founderID"]]
+        group["searchType"] = "group"
+    return results
+
+
+def searchUsers(keyword: str) -> list[dict]:
+    """
+    搜索用户并补充头像路径
+
+    Args:
+        keyword: 搜索关键词
+
+    Returns:
+        list[dict]: 用户信息列表，每项附带profilePhoto和searchType
+    """
+    results = db.searchUser(keyword)
+    profilePhotos = fileMgr.getProfilePhotoPaths(user["id"] for user in results)
+    for user in results:
+        user["profilePhoto"] = profilePhotos[user["id"]]
+        user["searchType"] = "user"
+    return results
+
+
+searchHandlers = {"user": searchUsers, "group": searchGroups, "book": searchBooks,
+                  "journal": searchJournals}  # 搜索类型 -> 搜索函数，综合搜索的结果按此顺序拼接
+
+
 @app.route("/search", methods=["GET"])
 def search():
     """
@@ -871,47 +1062,12 @@ def search():
     searchType = request.args.get("type")
     keyword = request.args.get("keyword")
 
-    if searchType == "journal":
-        results = db.searchJournal(keyword)
-        for i in range(len(results)):
-            results[i]["header"] = fileMgr.getJournalHeaderPath(results[i]["id"], enableDefault=True)
-            results[i]["searchType"] = "journal"
-    elif searchType == "book":
-        results = db.searchBook(keyword)
-        for i in range(len(results)):
-            results[i]["bookCover"] = fileMgr.getBookCoverPath(results[i]["id"], enableDefault=True)
-            results[i]["searchType"] = "book"
-    elif searchType == "group":
-        results = db.searchGroup(keyword)
-        for i in range(len(results)):
-            results[i]["groupIcon"] = fileMgr.getGroupIconPath(results[i]["id"], enableDefault=True)
-            results[i]["founder"] = db.getUser(results[i]["founderID"])["account"]
-            results[i]["searchType"] = "group"
-    elif searchType == "user":
-        results = db.searchUser(keyword)
-        for i in range(len(results)):
-            results[i]["profilePhoto"] = fileMgr.getProfilePhotoPath(results[i]["id"], enableDefault=True)
-            results[i]["searchType"] = "user"
+    if searchType in searchHandlers:
+        results = searchHandlers[searchType](keyword)
     elif searchType == "all":
-        users = db.searchUser(keyword)
-        for i in range(len(users)):
-            users[i]["profilePhoto"] = fileMgr.getProfilePhotoPath(users[i]["id"], enableDefault=True)
-            users[i]["searchType"] = "user"
-        groups = db.searchGroup(keyword)
-        for i in range(len(groups)):
-            groups[i]["groupIcon"] = fileMgr.getGroupIconPath(groups[i]["id"], enableDefault=True)
-            groups[i]["founder"] = db.getUser(groups[i]["founderID"])["account"]
-            groups[i]["searchType"] = "group"
-        books = db.searchBook(keyword)
-        for i in range(len(books)):
-            books[i]["bookCover"] = fileMgr.getBookCoverPath(books[i]["id"], enableDefault=True)
-            books[i]["searchType"] = "book"
-        journals = db.searchJournal(keyword)
-        for i in range(len(journals)):
-            journals[i]["header"] = fileMgr.getJournalHeaderPath(journals[i]["id"], enableDefault=True)
-            journals[i]["searchType"] = "journal"
-        results = users + groups + books + journals
-
+        # 四类搜索（含各自的图片路径和用户名）互不依赖，并发执行，总耗时取决于最慢的一类而不是四类之和
+        futures = [searchExecutor.submit(runInAppContext, func, keyword) for func in searchHandlers.values()]
+        results = [result for future in futures for result in future.result()]
     else:
         abort(404)
         return
@@ -920,6 +1076,7 @@ def search():
                            costTime=costTime, searchType=searchType)
 
 
+
 """9.消息中心"""
 
 
@@ -945,26 +1102,14 @@ def message():
         return redirect(url_for("index"))
     # 将所有消息按照ID整理为字典
     messages = db.getAllUnreadMessage(userID=session.get("loginUser").get("id"))
-    journalIDList = list(set(i['journalID'] for i in messages['journalComment']))
-    groupIDList = list(set(i['groupID'] for i in messages['groupDiscussion']))
-    discussionIDList = list(set(i['discussionID'] for i in messages['discussionReply']))
-    chatIDList = list(set(i['senderID'] for i in messages['chat']))
-    journalIDList.sort()
-    groupIDList.sort()
-    discussionIDList.sort()
-    chatIDList.sort()
-    journals, journalsInfo, groups, groupsInfo, discussions, discussionsInfo, chats = {}, {}, {}, {}, {}, {}, {}
-    for journalID in journalIDList:
-        journals[journalID] = [i for i in messages['journalComment'] if i['journalID'] == journalID]
-        journalsInfo[journalID] = db.getJournal(journalID)
-    for groupID in groupIDList:
-        groups[groupID] = [i for i in messages['groupDiscussion'] if i['groupID'] == groupID]
-        groupsInfo[groupID] = db.getGroup(groupID)
-    for discussionID in discussionIDList:
-        discussions[discussionID] = [i for i in messages['discussionReply'] if i['discussionID'] == discussionID]
-        discussionsInfo[discussionID] = db.getGroupDiscussion(discussionID)
-    for senderID in chatIDList:
-        chats[senderID] = [i for i in messages['chat'] if i['senderID'] == senderID]
+    journals = groupMessages(messages['journalComment'], 'journalID')
+    groups = groupMessages(messages['groupDiscussion'], 'groupID')
+    discussions = groupMessages(messages['discussionReply'], 'discussionID')
+    chats = groupMessages(messages['chat'], 'senderID')
+    # 每类相关对象只查询一次
+    journalsInfo = db.getAllJournalByID(list(journals))
+    groupsInfo = db.getAllGroupByID(list(groups))
+    discussionsInfo = db.getAllGroupDiscussionByID(list(discussions))
     return render_template("message.html", loginUser=session.get("loginUser"), chats=chats,
                            journals=journals, journalInfo=journalsInfo,
                            groups=groups, groupInfo=groupsInfo,
@@ -31,16 +31,20 @@
 
 # -*- coding: utf-8 -*-
 import os
-import subprocess
+import re
 import warnings
 
 import pymysql
+from pymysql.constants import CLIENT
 from werkzeug.security import generate_password_hash
 
 from Service.utils import getConfig
 
 # 获取相关配置信息
 db_info = getConfig("Database")  # 数据库配置信息
+# 常用的配置项绑定为局部变量
+db_host, db_name = db_info["Host"], db_info["Database"]
+db_account, db_password = db_info["Account"], db_info["Password"]
 admin_info = getConfig("Admin")  # 管理员配置信息
 # ddl_path = os.path.join(os.getcwd(), "DDL.sql").replace("\\", "/")
 ddl_path = r'D:\wps\专业课\软件工程\test\DDL.sql'  # DDL文件路径
@@ -64,75 +68,67 @@ print(">>---------------------------------------初始化数据库--------------
 
 # 建立数据库连接
 conn = pymysql.connect(
-    host=db_info["localhost"],  # 数据库主机地址
-    port=db_info["3306"],      # 数据库端口
+    host=db_host,               # 数据库主机地址
+    port=int(db_info["Port"]),  # 数据库端口
     user='root',               # 数据库用户名
-    password='1234'            # 数据库密码
+    password='1234',           # 数据库密码
+    client_flag=CLIENT.MULTI_STATEMENTS  # 允许一次发送多条语句，用于导入DDL
 )
 cursor = conn.cursor()  # 创建游标对象
 
-# 创建数据库
-try:
-    # 创建数据库，设置字符集和排序规则
-    cursor.execute(
-        "CREATE DATABASE IF NOT EXISTS %s DEFAULT CHARSET utf8 COLLATE utf8_general_ci;" % db_info["Database"])
-    print(f"数据库 {db_info['Database']} 创建成功")
-except pymysql.err.OperationalError:
-    warnings.warn("数据库创建失败，请检查数据库名称是否合法")
+# 创建数据库、数据库管理员账户并授予所有权限，三条语句一次发送
+ER_NOT_VALID_PASSWORD = 1819  # MySQL错误码：密码不满足validate_password的安全策略
+# 数据库名是标识符，无法作为参数绑定，校验后再拼接；用户名、主机和密码作为参数由pymysql转义
+if not re.fullmatch(r"[A-Za-z0-9_]+", db_name):
+    warnings.warn("数据库创建失败，数据库名称只能包含字母、数字和下划线")
     exit(-1)
-
-# 创建数据库管理员账户
+create_database = f"CREATE DATABASE IF NOT EXISTS `{db_name}` DEFAULT CHARSET utf8 COLLATE utf8_general_ci;"
+create_user = cursor.mogrify("CREATE USER IF NOT EXISTS %s@%s IDENTIFIED BY %s;", (db_account, db_host, db_password))
+grant = cursor.mogrify(f"GRANT ALL PRIVILEGES ON `{db_name}`.* TO %s@%s;", (db_account, db_host))
 try:
-    # 创建数据库用户
-    cursor.execute("CREATE USER IF NOT EXISTS '%s'@'%s' IDENTIFIED BY '%s';" % (
-        db_info["Account"], db_info["Host"], db_info["Password"]))
-    print(f"用户'%s'@'%s'创建成功，密码: %s" % (db_info["Account"], db_info["Host"], db_info["Password"]))
-except pymysql.err.OperationalError:  # 密码太简单，尝试降低安全级别再创建用户
-    # 降低密码安全策略级别
+    cursor.execute(create_database + create_user + grant)
+    while cursor.nextset():  # 取回后续语句的结果，出错的语句会在此处抛出异常
+        pass
+except (pymysql.err.OperationalError, pymysql.err.ProgrammingError) as e:
+    if e.args[0] != ER_NOT_VALID_PASSWORD:
+        warnings.warn("数据库创建失败，请检查数据库名称是否合法")
+        exit(-1)
+    # 密码太简单，降低密码安全策略级别后重新创建用户并授权（数据库已创建成功）
     cursor.execute("SET global validate_password.policy = 0;")
-    conn.commit()
-    cursor.execute("CREATE USER IF NOT EXISTS '%s'@'%s' IDENTIFIED BY '%s';" % (
-        db_info["Account"], db_info["Host"], db_info["Password"]))
+    cursor.execute(create_user + grant)
+    while cursor.nextset():
+        pass
     warnings.warn(f"密码级别过低，已降低密码安全级别")
-    print(f"用户'%s'@'%s'创建成功，密码: %s" % (db_info["Account"], db_info["Host"], db_info["Password"]))
-
-# 为数据库管理员账户授权
-# 授予所有权限
-cursor.execute(
-    "GRANT ALL PRIVILEGES ON %s.* TO '%s'@'%s';" % (db_info["Database"], db_info["Account"], db_info["Host"]))
-print(f"用户'%s'@'%s'授权成功" % (db_info["Account"], db_info["Host"]))
-conn.commit()
+print(f"数据库 {db_name} 创建成功")
+print(f"用户'%s'@'%s'创建成功，密码: %s" % (db_account, db_host, db_password))
+print(f"用户'%s'@'%s'授权成功" % (db_account, db_host))
+# 建库、建用户、授权和DDL都会由MySQL隐式提交，整个脚本只需在写入初始数据后提交一次
 
 # 导入DDL（数据库表结构）
-print("mysql -u%s -p%s -h%s -P%s %s < %s" % (
-        'root', root_passwd, db_info["Host"], db_info["Port"], db_info["Database"], ddl_path
-))
-
-# 使用subprocess执行mysql命令导入DDL
-mysqlpath = r'D:\mysql\bin\mysql.exe'  # MySQL可执行文件路径
-result = subprocess.call(mysqlpath + " -u%s -p%s -h%s -P%s %s < %s" % (
-        'root', root_passwd, db_info["Host"], db_info["Port"], db_info["Database"], ddl_path
-), shell=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-print(result)
-if result == 0:
+# 复用当前连接，将整个DDL文件作为多语句一次发送给服务器执行，无需再启动mysql客户端进程
+try:
+    with open(ddl_path, "r", encoding="utf-8") as f:
+        ddl = f.read()
+    conn.select_db(db_name)
+    cursor.execute(ddl)
+    while cursor.nextset():  # 逐个取回各条语句的结果，执行出错的语句会在此处抛出异常
+        pass
     print("数据库表结构导入成功")
-else:
-    warnings.warn("数据库表结构导入失败")
+except (OSError, pymysql.err.MySQLError) as e:
+    warnings.warn(f"数据库表结构导入失败: {e}")
     exit(-1)
 
 print(">>---------------------------------------创建平台管理员---------------------------------------<<")
 
-# 创建平台管理员账户
+# 创建平台管理员账户（导入DDL时已通过select_db选中数据库）
+insert_user = "INSERT INTO user(id,account,password,signature,email,telephone,role) VALUES (%s,%s,%s,%s,%s,%s,%s)"
 try:
-    # 选择数据库
-    cursor.execute("USE %s;" % db_info["Database"])
-    # 插入管理员账户信息
-    cursor.execute(
-        """INSERT INTO user(id,account,password,signature,email,telephone,role) VALUES (%s,%s,%s,%s,%s,%s,%s);""",
-        (admin_info["ID"], admin_info["Account"], generate_password_hash(admin_info["Password"]),
-         admin_info["Signature"],
-         admin_info["E-Mail"], admin_info["Telephone"], "admin")
-    )
+    # 需要预置的用户，目前只有平台管理员；新增的初始用户追加到列表中即可
+    # 密码哈希算法与Service.DB.Operation中的_PASSWORD_METHOD一致，首次登录时不必再重新哈希
+    rows = [(admin_info["ID"], admin_info["Account"], generate_password_hash(admin_info["Password"], "scrypt"),
+             admin_info["Signature"], admin_info["E-Mail"], admin_info["Telephone"], "admin")]
+    # executemany会把多行合并为一条多行VALUES的INSERT，一次往返写入全部用户
+    cursor.executemany(insert_user, rows)
     conn.commit()
     print(f"管理员账户 {admin_info['Account']} 创建成功，密码: {admin_info['Password']}")
 except pymysql.err.IntegrityError:
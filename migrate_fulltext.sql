@@ -0,0 +1,10 @@
+-- 为按旧版DDL.sql创建的数据库补建全文索引，已有这三个索引的数据库无需执行
+-- 用法：mysql -u root -p moyun < migrate_fulltext.sql
+-- 执行后需重启应用，搜索才会改用全文索引；未执行时搜索照常使用LIKE，结果不变
+
+-- 全文索引不使用停用词表：ngram分词下，含停用词(如a、i)的词元都会被丢弃，全文检索结果将与LIKE不一致
+SET SESSION innodb_ft_enable_stopword = OFF;
+
+ALTER TABLE `book` ADD FULLTEXT KEY `book_fulltext` (`title`,`author`) WITH PARSER `ngram`;
+ALTER TABLE `group` ADD FULLTEXT KEY `group_fulltext` (`name`,`description`) WITH PARSER `ngram`;
+ALTER TABLE `journal` ADD FULLTEXT KEY `journal_fulltext` (`title`,`content`) WITH PARSER `ngram`;